@@ -0,0 +1,56 @@
+"""Submit chat-completion request bodies as one OpenAI Batch API job and wait for the results.
+
+Half the price of real-time calls and a separate rate-limit pool, at the cost of minutes-to-hours
+turnaround. Any failure, expiry or timeout returns None so callers fall back to real-time calls.
+"""
+import time
+import orjson
+from ._client import client
+from ._retry import call
+from .config import BATCH_POLL_SEC, BATCH_MAX_WAIT_SEC
+
+__all__ = ["run"]
+
+_TERMINAL = {"completed", "failed", "expired", "cancelled"}
+
+def _request_line(custom_id: str, body: dict) -> bytes:
+    return orjson.dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body})
+
+def run(bodies: dict, tag: str = "batch"):
+    """
+    bodies: {custom_id: /v1/chat/completions request body}.
+    Returns {custom_id: response body} for the requests that succeeded, or None if the job did not complete.
+    """
+    if not bodies: return {}
+    jsonl = b"\n".join(_request_line(cid, body) for cid, body in bodies.items())
+    try:
+        f = call(client.files.create, file=(f"{tag}.jsonl", jsonl), purpose="batch")
+        batch = call(client.batches.create, input_file_id=f.id, endpoint="/v1/chat/completions",
+                     completion_window="24h")
+        print(f"[{tag}] submitted id={batch.id} requests={len(bodies)}")
+
+        deadline = time.monotonic() + BATCH_MAX_WAIT_SEC
+        while batch.status not in _TERMINAL and time.monotonic() < deadline:
+            time.sleep(BATCH_POLL_SEC)
+            batch = call(client.batches.retrieve, batch_id=batch.id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            print(f"[{tag}] id={batch.id} status={batch.status}; falling back to real-time calls")
+            if batch.status not in _TERMINAL:
+                call(client.batches.cancel, batch_id=batch.id)
+            return None
+
+        output = call(client.files.content, file_id=batch.output_file_id).text
+    except Exception as e:
+        print(f"[{tag}] error: {type(e).__name__}; falling back to real-time calls")
+        return None
+
+    out = {}
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        rec = orjson.loads(line)
+        body = (rec.get("response") or {}).get("body") or {}
+        if rec.get("custom_id") in bodies and body.get("choices"):
+            out[rec["custom_id"]] = body
+    return out
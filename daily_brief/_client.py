@@ -0,0 +1,25 @@
+"""Process-wide OpenAI clients so every module shares one keep-alive connection pool."""
+import asyncio
+import weakref
+import openai
+from openai import OpenAI, AsyncOpenAI
+from .config import OPENAI_API_KEY
+
+__all__ = ["client", "aclient"]
+
+_TIMEOUT = openai.Timeout(60.0, connect=5.0)
+
+# max_retries=0: _retry owns retries, so SDK and tenacity attempts do not multiply
+client = OpenAI(api_key=OPENAI_API_KEY, timeout=_TIMEOUT, max_retries=0)
+
+# An AsyncOpenAI pool is bound to the loop it first ran on, and each sync shim runs its own
+# asyncio.run(): one client per live loop, dropped with the loop
+_ASYNC_CLIENTS = weakref.WeakKeyDictionary()
+
+def aclient() -> AsyncOpenAI:
+    """The async client for the running event loop (shared by every coroutine on that loop)."""
+    loop = asyncio.get_running_loop()
+    c = _ASYNC_CLIENTS.get(loop)
+    if c is None:
+        c = _ASYNC_CLIENTS[loop] = AsyncOpenAI(api_key=OPENAI_API_KEY, timeout=_TIMEOUT, max_retries=0)
+    return c
@@ -0,0 +1,68 @@
+"""Persistent (headline text -> label) memo for the labeling passes, backed by SQLite (WAL).
+
+Keys are blake2b(text) + ":" + model + ":" + field, so a model switch never serves stale labels.
+Hits and writes are also kept in a bounded in-process LRU so re-seen headlines skip SQLite.
+"""
+import os, sys, sqlite3, hashlib
+from collections import OrderedDict
+from .config import LABEL_CACHE_PATH, MODEL_UTILITY
+
+_MEMO_MAX = 4096
+_conn = None
+_memo = OrderedDict()  # only known labels; misses are not memoized since put() may fill them later
+
+def _remember(k: str, v: str):
+    _memo[k] = v
+    _memo.move_to_end(k)
+    if len(_memo) > _MEMO_MAX:
+        _memo.popitem(last=False)
+
+def _db() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(LABEL_CACHE_PATH) or ".", exist_ok=True)
+        _conn = sqlite3.connect(LABEL_CACHE_PATH)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("CREATE TABLE IF NOT EXISTS labels (k TEXT PRIMARY KEY, v TEXT NOT NULL)")
+    return _conn
+
+def key(text: str, field: str) -> str:
+    digest = hashlib.blake2b((text or "").encode("utf-8"), digest_size=16).hexdigest()
+    return f"{digest}:{MODEL_UTILITY}:{field}"
+
+def get(k: str):
+    if k in _memo:
+        _memo.move_to_end(k)
+        return _memo[k]
+    row = _db().execute("SELECT v FROM labels WHERE k = ?", (k,)).fetchone()
+    if row:
+        _remember(k, row[0])
+    return row[0] if row else None
+
+def put(k: str, v: str):
+    put_many([(k, v)])
+
+def put_many(pairs: list):
+    if not pairs: return
+    with _db() as conn:  # one transaction (one fsync) per call
+        conn.executemany("INSERT OR REPLACE INTO labels (k, v) VALUES (?, ?)", pairs)
+    for k, v in pairs:
+        _remember(k, v)
+
+def fill(items: list, indices: list, field: str, text_of) -> None:
+    """Set items[i][field] from the cache for every index with a stored label."""
+    try:
+        for i in indices:
+            v = get(key(text_of(items[i]), field))
+            if v:
+                items[i][field] = sys.intern(v)
+    except sqlite3.Error as e:
+        print(f"[label_cache] read error: {type(e).__name__}")
+
+def store(items: list, indices: list, field: str, text_of) -> None:
+    """Persist items[i][field] for the given indices in a single transaction."""
+    try:
+        put_many([(key(text_of(items[i]), field), items[i][field]) for i in indices
+                  if items[i].get(field) not in (None, "", "Unknown")])
+    except sqlite3.Error as e:
+        print(f"[label_cache] write error: {type(e).__name__}")
@@ -0,0 +1,55 @@
+"""Cheap local pre-pass for headline labels: compiled keyword rules, no API calls.
+
+Rules are deliberately conservative. A sector is assigned only when exactly one
+sector's keywords match, and a sentiment only when the cues are one-sided;
+anything ambiguous is left for the LLM.
+"""
+import re
+
+def _rx(*words: str) -> re.Pattern:
+    return re.compile(r"\b(?:" + "|".join(words) + r")\b", re.I)
+
+SECTOR_KEYWORDS = {
+    "Energy": _rx(r"oil", r"crude", r"brent", r"wti", r"opec\+?", r"lng", r"natural gas", r"coal", r"refiner(?:y|ies)"),
+    "Materials": _rx(r"nickel", r"copper", r"steel", r"alumin(?:i)?um", r"iron ore", r"cement", r"gold miners?"),
+    "Financials": _rx(r"banks?", r"lenders?", r"insurers?", r"brokerages?", r"asset managers?"),
+    "Real Estate": _rx(r"property developers?", r"real estate", r"reits?"),
+    "Utilities": _rx(r"utilit(?:y|ies)", r"power grid", r"electricity tariffs?"),
+    "Health Care": _rx(r"pharma(?:ceuticals?)?", r"drugmakers?", r"biotech", r"hospitals?", r"vaccines?"),
+    "Information Technology": _rx(r"semiconductors?", r"chipmakers?", r"software", r"nvidia", r"tsmc"),
+    "Communication Services": _rx(r"telecoms?", r"telcos?", r"streaming"),
+    "Consumer Discretionary": _rx(r"automakers?", r"carmakers?", r"e-commerce", r"luxury"),
+    "Consumer Staples": _rx(r"supermarkets?", r"tobacco", r"packaged foods?"),
+    "Industrials": _rx(r"airlines?", r"shipbuild(?:er|ers|ing)", r"railways?", r"aerospace", r"defen[cs]e contractors?"),
+}
+
+POSITIVE_CUES = _rx(
+    r"beats? (?:estimates|expectations|forecasts)", r"record (?:high|profit)s?", r"surg(?:e|es|ed|ing)",
+    r"soar(?:s|ed|ing)?", r"rall(?:y|ies|ied)", r"upgrade[sd]?", r"raises? (?:guidance|forecast|dividend)s?",
+)
+NEGATIVE_CUES = _rx(
+    r"plunge[sd]?", r"plunging", r"slump(?:s|ed)?", r"tumble[sd]?", r"sinks?", r"crash(?:es|ed)?",
+    r"downgrade[sd]?", r"miss(?:es|ed)? (?:estimates|expectations|forecasts)", r"cuts? (?:guidance|forecast)s?",
+    r"defaults?", r"bankruptcy", r"layoffs?", r"profit warning",
+)
+
+def local_sector(text: str):
+    hits = [sec for sec, rx in SECTOR_KEYWORDS.items() if rx.search(text)]
+    return hits[0] if len(hits) == 1 else None
+
+def local_sentiment(text: str):
+    pos = POSITIVE_CUES.search(text) is not None
+    neg = NEGATIVE_CUES.search(text) is not None
+    if pos == neg:
+        return None
+    return "Positive" if pos else "Negative"
+
+_RULES = {"sector": local_sector, "sentiment": local_sentiment}
+
+def fill(items: list, indices: list, field: str, text_of) -> None:
+    """Set items[i][field] wherever a local rule is confident."""
+    rule = _RULES[field]
+    for i in indices:
+        lab = rule(text_of(items[i]))
+        if lab:
+            items[i][field] = lab
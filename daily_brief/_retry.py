@@ -0,0 +1,45 @@
+"""Shared retry policy for OpenAI calls.
+
+Only transient failures (429, timeouts, connection drops, 5xx) are retried, waiting as
+long as the server's Retry-After asks or else with full-jitter exponential backoff;
+permanent errors such as BadRequestError fail fast. The SDK's own retries are disabled
+in _client so this is the only retry layer.
+"""
+import openai
+from tenacity import retry, retry_if_exception_type, wait_random_exponential, stop_after_attempt
+
+TRANSIENT_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+_backoff = wait_random_exponential(multiplier=0.5, max=30)
+
+def _wait(retry_state) -> float:
+    """Honor retry-after-ms / retry-after (seconds) from the error response, capped at 60 s."""
+    headers = getattr(getattr(retry_state.outcome.exception(), "response", None), "headers", None) or {}
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        try:
+            return min(float(headers[name]) * scale, 60.0)
+        except (KeyError, TypeError, ValueError):  # absent, or an HTTP-date
+            pass
+    return _backoff(retry_state)
+
+retry_transient = retry(
+    retry=retry_if_exception_type(TRANSIENT_ERRORS),
+    wait=_wait,
+    stop=stop_after_attempt(6),
+    reraise=True,
+)
+
+@retry_transient
+def call(create, **kwargs):
+    """call(client.chat.completions.create, model=..., ...) with retries."""
+    return create(**kwargs)
+
+@retry_transient
+async def acall(create, **kwargs):
+    """Async counterpart of call() for AsyncOpenAI methods."""
+    return await create(**kwargs)
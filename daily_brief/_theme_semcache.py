@@ -0,0 +1,55 @@
+"""Embedding-similarity cache for emerging themes (JSONL at THEMES_SEMCACHE_PATH).
+
+Entries keep the supporting headlines rather than indices, so a hit can be re-grounded
+against the current run's items.
+"""
+import os, time
+import orjson
+from ._util import unit
+from .config import THEMES_SEMCACHE_PATH, THEMES_SEMCACHE_SIM, THEMES_CACHE_TTL_SEC
+
+__all__ = ["lookup", "add"]
+
+_entries = None
+
+def _load() -> list:
+    global _entries
+    if _entries is None:
+        _entries = []
+        cutoff = time.time() - THEMES_CACHE_TTL_SEC
+        try:
+            with open(THEMES_SEMCACHE_PATH, "rb") as f:
+                for line in f:
+                    try:
+                        e = orjson.loads(line)
+                    except ValueError:
+                        continue
+                    if e.get("ts", 0) >= cutoff:
+                        _entries.append(e)
+        except OSError:
+            pass
+    return _entries
+
+def lookup(embedding: list, model: str, max_themes: int):
+    """Themes of the most similar fresh entry for this model and theme count if cosine >= THEMES_SEMCACHE_SIM, else None."""
+    q = unit(embedding)
+    best, best_sim = None, THEMES_SEMCACHE_SIM
+    for e in _load():
+        if e.get("model") != model or e.get("max_themes") != max_themes:
+            continue  # another model or theme count would have answered differently
+        sim = sum(a * b for a, b in zip(q, e["emb"]))  # stored vectors are unit length
+        if sim >= best_sim:
+            best, best_sim = e, sim
+    return best["themes"] if best else None
+
+def add(embedding: list, themes: list, model: str, max_themes: int) -> None:
+    entry = {"emb": unit(embedding), "themes": themes, "model": model, "max_themes": max_themes, "ts": time.time()}
+    _load().append(entry)
+    try:  # rewrite rather than append so expired entries dropped by _load() leave the file too
+        os.makedirs(os.path.dirname(THEMES_SEMCACHE_PATH) or ".", exist_ok=True)
+        tmp = THEMES_SEMCACHE_PATH + ".tmp"
+        with open(tmp, "wb") as f:
+            f.writelines(orjson.dumps(e) + b"\n" for e in _entries)
+        os.replace(tmp, THEMES_SEMCACHE_PATH)
+    except OSError as e:
+        print(f"[themes_semcache] write error: {type(e).__name__}")
@@ -0,0 +1,99 @@
+"""Small helpers shared by the LLM passes, including the adaptive batch-size controller."""
+import re
+import math
+import openai
+from ._retry import acall
+from .config import MAX_PER_BATCH, MAX_PER_BATCH_CEIL
+
+# Grown while x-ratelimit headers show headroom, halved on 429; starts at the configured size
+_batch_size = MAX_PER_BATCH
+
+def batch_size() -> int:
+    return _batch_size
+
+def max_tokens_for(n: int) -> int:
+    """Completion budget for a batch of n headlines (600 at the default size of 6)."""
+    return max(600, 100 * n)
+
+def observe(headers, used_tokens: int) -> None:
+    """Grow the batch size when the remaining TPM budget comfortably covers another call."""
+    global _batch_size
+    try:
+        remaining = int(headers.get("x-ratelimit-remaining-tokens"))
+    except (TypeError, ValueError):
+        return
+    if used_tokens and remaining > 2 * used_tokens:
+        _batch_size = min(_batch_size + 2, MAX_PER_BATCH_CEIL)
+
+def on_rate_limit() -> None:
+    global _batch_size
+    _batch_size = max(_batch_size // 2, 2)
+
+async def acall_shaped(create_raw, **kwargs):
+    """acall() for a with_raw_response method: shrink on every 429, grow from headers, return the parsed response."""
+    async def attempt(**kw):
+        try:
+            return await create_raw(**kw)
+        except openai.RateLimitError:
+            on_rate_limit()
+            raise
+    raw = await acall(attempt, **kwargs)
+    resp = raw.parse()
+    usage = getattr(resp, "usage", None)
+    observe(raw.headers, getattr(usage, "total_tokens", 0) or 0)
+    return resp
+
+def unit(vec: list) -> list:
+    """L2-normalize so cosine similarity is a plain dot product."""
+    n = math.sqrt(sum(x * x for x in vec)) or 1.0
+    return [x / n for x in vec]
+
+def batches(indices: list, size: int):
+    """Yield consecutive slices of `indices` (already absolute item indices) of at most `size`."""
+    for s in range(0, len(indices), size):
+        yield indices[s:s+size]
+
+# Only these characters can change the scanner's state; everything between them is skipped in C
+_JSON_SPECIAL_RE = re.compile(r'[{}"\\]')
+
+def read_json_stream(stream):
+    """
+    Accumulate streamed content until the top-level JSON object closes, then stop reading.
+    Fails fast (ValueError) if the reply does not open with '{'. Returns (text, response id).
+    """
+    buf, resp_id, started, depth, in_str, esc_at = [], None, False, 0, False, -1
+    try:
+        for chunk in stream:
+            resp_id = resp_id or getattr(chunk, "id", None)
+            piece = (chunk.choices[0].delta.content or "") if chunk.choices else ""
+            if not started:
+                lead = piece.lstrip()
+                if not lead:
+                    continue
+                if lead[0] != "{":
+                    raise ValueError("reply is not a JSON object")
+                started = True
+            for m in _JSON_SPECIAL_RE.finditer(piece):
+                ch, j = m.group(), m.start()
+                if in_str:
+                    if j == esc_at:
+                        continue  # escaped character
+                    if ch == "\\":
+                        esc_at = j + 1
+                    elif ch == '"':
+                        in_str = False
+                elif ch == '"':
+                    in_str = True
+                elif ch == "{":
+                    depth += 1
+                elif ch == "}":
+                    depth -= 1
+                    if depth == 0:
+                        buf.append(piece[:j + 1])
+                        return "".join(buf), resp_id
+            # A trailing backslash escapes the first character of the next piece
+            esc_at = 0 if esc_at == len(piece) else -1
+            buf.append(piece)
+    finally:
+        stream.close()
+    return "".join(buf), resp_id
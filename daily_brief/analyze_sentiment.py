@@ -1,65 +1,69 @@
-"""Batch sentiment classification with a single model (GPT-5), JSON-mode."""
-import json, time, random, openai
-from openai import OpenAI
-from .config import OPENAI_API_KEY, MODEL_CLASSIFY, MAX_PER_BATCH, HEADLINE_ONLY_FOR_UTILITY
+"""Batch sentiment classification (MODEL_UTILITY), one `<index>:<P|N|U>` line per headline."""
+import asyncio
+from ._client import aclient
+from ._util import batches, batch_size, max_tokens_for, acall_shaped
+from .config import MODEL_UTILITY, MAX_WORKERS
+from . import _label_cache, _local_labels
+from .label_items import abatch_assign_labels, EXAMPLES, _headline_lines, _item_text
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+__all__ = ["abatch_assign_sentiment", "batch_assign_sentiment"]
 
-def _backoff(call, *args, **kwargs):
-    delay = 0.35
-    for attempt in range(6):
-        try:
-            return call(*args, **kwargs)
-        except openai.RateLimitError:
-            if attempt == 5: raise
-            time.sleep(delay + random.uniform(0, 0.25))
-            delay = min(delay * 2, 6.0)
-        except Exception:
-            if attempt == 5: raise
-            time.sleep(delay + random.uniform(0, 0.25))
-            delay = min(delay * 2, 6.0)
+_CODES = {"P": "Positive", "N": "Negative", "U": "Neutral"}
+_CODE_OF = {v: k for k, v in _CODES.items()}
 
-def _batches(indices, size):
-    for i in range(0, len(indices), size):
-        yield indices[i:i+size]
+# Built once at import: byte-identical across calls so the cached prefix is reused
+SYSTEM_PREFIX = (
+    "You label equity-market news headlines.\n"
+    "For each numbered headline, assign sentiment strictly as P (Positive), N (Negative) or U (Neutral).\n"
+    "Reply with one line per headline, in order, formatted <index>:<P|N|U> using the index shown "
+    "before the headline. No JSON, no prose.\n\n"
+    "Examples:\n"
+    + "\n".join(f"- {h} => {_CODE_OF[snt]}" for h, snt, _ in EXAMPLES)
+)
 
-def batch_assign_sentiment(items: list) -> None:
+async def _sentiment_group(items: list, group: list, sem: asyncio.Semaphore) -> None:
+    async with sem:
+        resp = await acall_shaped(
+            aclient().chat.completions.with_raw_response.create,
+            model=MODEL_UTILITY,
+            messages=[
+                {"role": "system", "content": SYSTEM_PREFIX},
+                {"role": "user", "content": _headline_lines(items, group)},
+            ],
+            max_completion_tokens=max_tokens_for(len(group)),
+        )
+    allowed, done = set(group), []
+    for line in (resp.choices[0].message.content or "").splitlines():
+        i, sep, code = line.partition(":")
+        if not sep or not i.strip().isdigit():
+            continue
+        idx = int(i) - 1
+        # Unknown codes keep the Neutral default and stay uncached, so a later run asks again
+        if idx in allowed and (label := _CODES.get(code.strip()[:1].upper())):
+            items[idx]["sentiment"] = label
+            done.append(idx)
+    _label_cache.store(items, done, "sentiment", _item_text)
+
+async def abatch_assign_sentiment(items: list) -> None:
     if not items: return
+    await abatch_assign_labels(items)  # fused call for items missing both labels
     targets = [i for i, it in enumerate(items) if not it.get("sentiment")]
     if not targets: return
+    _local_labels.fill(items, targets, "sentiment", _item_text)
+    _label_cache.fill(items, targets, "sentiment", _item_text)
+    targets = [i for i in targets if not items[i].get("sentiment")]
+    if not targets: return
+    for i in targets:  # default up front; parsed lines overwrite it
+        items[i]["sentiment"] = "Neutral"
 
-    for group in _batches(targets, MAX_PER_BATCH):
-        lines = []
-        for i in group:
-            text = items[i].get("headline","")
-            if not HEADLINE_ONLY_FOR_UTILITY:
-                text += " " + (items[i].get("content","")[:160])
-            lines.append(f"{i+1}. {text}")
-
-        prompt = (
-            "For each headline, assign sentiment strictly as one of: Positive, Negative, Neutral.\n"
-            "Return ONLY a JSON object:\n"
-            '{"mapping":[{"i": <absolute_index>, "sentiment": "Positive|Negative|Neutral"}]}\n'
-            "Use <absolute_index> as the 1-based index shown before each headline.\n\n"
-            + "\n".join(lines)
-        )
-
-        resp = _backoff(
-            client.chat.completions.create,
-            model=MODEL_CLASSIFY,
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"},
-            max_completion_tokens=600,
-        )
-        payload = (resp.choices[0].message.content or "").strip()
-        data = json.loads(payload) if payload else {"mapping": []}
-
-        for m in data.get("mapping", []):
-            idx = int(m.get("i", 0)) - 1
-            lab = (m.get("sentiment","Neutral") or "Neutral").capitalize()
-            if 0 <= idx < len(items):
-                items[idx]["sentiment"] = lab if lab in {"Positive","Negative","Neutral"} else "Neutral"
+    sem = asyncio.Semaphore(MAX_WORKERS)
+    results = await asyncio.gather(
+        *[_sentiment_group(items, group, sem) for group in batches(targets, batch_size())],
+        return_exceptions=True,
+    )
+    for r in results:
+        if isinstance(r, Exception):
+            print(f"[sentiment] batch error: {type(r).__name__}")
 
-    for it in items:
-        if not it.get("sentiment"):
-            it["sentiment"] = "Neutral"
+def batch_assign_sentiment(items: list) -> None:
+    asyncio.run(abatch_assign_sentiment(items))
@@ -0,0 +1,46 @@
+"""Sentiment + sector labeling through the OpenAI Batch API (50% cheaper, not real-time).
+
+Items the batch does not label (failure, expiry, timeout) are left untouched so the
+real-time label pass can pick them up afterwards.
+"""
+from pydantic import ValidationError
+from ._util import batches
+from .config import MODEL_UTILITY, MAX_PER_BATCH
+from . import _batch, _label_cache, _local_labels
+from .label_items import COMBINED_SCHEMA, LabelMap, _build_messages, _apply_mapping, _item_text
+
+__all__ = ["batch_assign_labels_offline"]
+
+def _request_body(messages: list) -> dict:
+    return {
+        "model": MODEL_UTILITY,
+        "messages": messages,
+        "response_format": {"type": "json_schema", "json_schema": COMBINED_SCHEMA},
+        "max_completion_tokens": 600,
+    }
+
+def batch_assign_labels_offline(items: list) -> None:
+    """Label items missing both sentiment and sector via one Batch API job (one request per chunk)."""
+    if not items: return
+    targets = [i for i, it in enumerate(items) if not it.get("sentiment") and not it.get("sector")]
+    if not targets: return
+    _local_labels.fill(items, targets, "sentiment", _item_text)
+    _local_labels.fill(items, targets, "sector", _item_text)
+    _label_cache.fill(items, targets, "sentiment", _item_text)
+    _label_cache.fill(items, targets, "sector", _item_text)
+    targets = [i for i in targets if not items[i].get("sentiment") and not items[i].get("sector")]
+    if not targets: return
+
+    groups = {f"chunk-{n}": group for n, group in enumerate(batches(targets, MAX_PER_BATCH))}
+    results = _batch.run({cid: _request_body(_build_messages(items, g)) for cid, g in groups.items()})
+    if results is None: return
+
+    for cid, body in results.items():
+        payload = body["choices"][0]["message"].get("content") or "{}"
+        try:
+            done = _apply_mapping(items, groups[cid], LabelMap.model_validate_json(payload))
+        except ValidationError:
+            print(f"[batch] invalid output for {cid}; left for real-time labeling")
+            continue
+        _label_cache.store(items, done, "sentiment", _item_text)
+        _label_cache.store(items, done, "sector", _item_text)
@@ -1,68 +1,70 @@
-"""Batch GICS sector classification with a single model (GPT-5), JSON-mode."""
-import json, time, random, openai
-from openai import OpenAI
-from .config import OPENAI_API_KEY, MODEL, MODEL_CLASSIFY, MAX_PER_BATCH, GICS_SECTORS, HEADLINE_ONLY_FOR_UTILITY
+"""Batch GICS sector classification (MODEL_UTILITY), JSON-mode."""
+import sys
+import asyncio
+import orjson
+from ._client import aclient
+from ._util import batches, batch_size, max_tokens_for, acall_shaped
+from .config import MODEL_UTILITY, MAX_WORKERS, GICS_SECTORS, GICS_SECTORS_SET
+from . import _label_cache, _local_labels
+from .label_items import abatch_assign_labels, EXAMPLES, _headline_lines, _item_text
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+__all__ = ["abatch_assign_sector", "batch_assign_sector"]
 
-def _backoff(call, *args, **kwargs):
-    delay = 0.35
-    for attempt in range(6):
-        try:
-            return call(*args, **kwargs)
-        except openai.RateLimitError:
-            if attempt == 5: raise
-            time.sleep(delay + random.uniform(0, 0.25))
-            delay = min(delay * 2, 6.0)
-        except Exception:
-            if attempt == 5: raise
-            time.sleep(delay + random.uniform(0, 0.25))
-            delay = min(delay * 2, 6.0)
+# Built once at import: byte-identical across calls so the cached prefix is reused
+SYSTEM_PREFIX = (
+    "You label equity-market news headlines.\n"
+    "Assign exactly one GICS sector to each numbered headline from this set:\n"
+    + ", ".join(sorted(GICS_SECTORS)) + "\n\n"
+    "Return ONLY a JSON object:\n"
+    '{"mapping":[{"i": <absolute_index>, "sector": "<sector>"}]}\n'
+    "Use <absolute_index> as the 1-based index shown before each headline.\n\n"
+    "Examples:\n"
+    + "\n".join(f"- {h} => sector={sec}" for h, _, sec in EXAMPLES)
+)
 
-def _batches(indices, size):
-    for i in range(0, len(indices), size):
-        yield indices[i:i+size]
+async def _sector_group(items: list, group: list, sem: asyncio.Semaphore) -> None:
+    async with sem:
+        resp = await acall_shaped(
+            aclient().chat.completions.with_raw_response.create,
+            model=MODEL_UTILITY,
+            messages=[
+                {"role": "system", "content": SYSTEM_PREFIX},
+                {"role": "user", "content": _headline_lines(items, group)},
+            ],
+            response_format={"type": "json_object"},
+            max_completion_tokens=max_tokens_for(len(group)),
+        )
+    payload = (resp.choices[0].message.content or "").strip()
+    data = orjson.loads(payload) if payload else {"mapping": []}
 
-def batch_assign_sector(items: list) -> None:
+    allowed = set(group)
+    for m in data.get("mapping", []):
+        idx = int(m.get("i", 0)) - 1
+        sec = m.get("sector")
+        if idx in allowed and sec in GICS_SECTORS_SET:
+            items[idx]["sector"] = sys.intern(sec)
+    _label_cache.store(items, group, "sector", _item_text)
+
+async def abatch_assign_sector(items: list) -> None:
     if not items: return
+    await abatch_assign_labels(items)  # fused call for items missing both labels
     targets = [i for i, it in enumerate(items) if not it.get("sector")]
     if not targets: return
+    _local_labels.fill(items, targets, "sector", _item_text)
+    _label_cache.fill(items, targets, "sector", _item_text)
+    targets = [i for i in targets if not items[i].get("sector")]
+    if not targets: return
+    for i in targets:  # default up front; valid mappings overwrite it
+        items[i]["sector"] = "Unknown"
 
-    valid = ", ".join(GICS_SECTORS)
-
-    for group in _batches(targets, MAX_PER_BATCH):
-        lines = []
-        for i in group:
-            text = items[i].get("headline","")
-            if not HEADLINE_ONLY_FOR_UTILITY:
-                text += " " + (items[i].get("content","")[:160])
-            lines.append(f"{i+1}. {text}")
-
-        prompt = (
-            "Assign exactly one GICS sector to each headline from this set:\n"
-            f"{valid}\n\n"
-            "Return ONLY a JSON object:\n"
-            '{"mapping":[{"i": <absolute_index>, "sector": "<sector>"}]}\n'
-            "Use <absolute_index> as the 1-based index shown before each headline.\n\n"
-            + "\n".join(lines)
-        )
-
-        resp = _backoff(
-            client.chat.completions.create,
-            model=MODEL_CLASSIFY,
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"},
-            max_completion_tokens=600,
-        )
-        payload = (resp.choices[0].message.content or "").strip()
-        data = json.loads(payload) if payload else {"mapping": []}
-
-        for m in data.get("mapping", []):
-            idx = int(m.get("i", 0)) - 1
-            sec = m.get("sector", "Unknown")
-            if 0 <= idx < len(items):
-                items[idx]["sector"] = sec if sec in GICS_SECTORS else "Unknown"
+    sem = asyncio.Semaphore(MAX_WORKERS)
+    results = await asyncio.gather(
+        *[_sector_group(items, group, sem) for group in batches(targets, batch_size())],
+        return_exceptions=True,
+    )
+    for r in results:
+        if isinstance(r, Exception):
+            print(f"[sector] batch error: {type(r).__name__}")
 
-    for it in items:
-        if not it.get("sector"):
-            it["sector"] = "Unknown"
+def batch_assign_sector(items: list) -> None:
+    asyncio.run(abatch_assign_sector(items))
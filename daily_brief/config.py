@@ -3,21 +3,28 @@ import os
 
 #API
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-# Model selection: use GPT-5 Pro for all LLM tasks
 # Models
-MODEL = os.getenv("OPENAI_MODEL", "gpt-5")     # final JSON+Markdown compose
-MODEL_CLASSIFY = os.getenv("OPENAI_MODEL_CLASSIFY", "gpt-5-mini")
+MODEL = os.getenv("OPENAI_MODEL", "gpt-5")     # final JSON+Markdown compose only
+# Every utility classifier (sentiment, sector, fused labels) runs on the small model
+MODEL_UTILITY = os.getenv("OPENAI_MODEL_UTILITY") or os.getenv("OPENAI_MODEL_CLASSIFY", "gpt-5-mini")
+MODEL_CLASSIFY = MODEL_UTILITY  # backward-compatible alias
 MODEL_REASON = os.getenv("OPENAI_MODEL_REASON", "gpt-5")
 MODEL_COMPOSE_PREF = ["gpt-5-mini", "gpt-5"]
 # Limits & batching
 MAX_ARTICLES_TOTAL = int(os.getenv("MAX_ARTICLES_TOTAL", "12"))
 MAX_PER_BATCH = int(os.getenv("MAX_PER_BATCH", "6"))
+MAX_PER_BATCH_CEIL = int(os.getenv("MAX_PER_BATCH_CEIL", "16"))  # adaptive batch size upper bound
 MAX_COMPLETION_TOKENS = int(os.getenv("MAX_COMPLETION_TOKENS", "900"))
 SUMMARY_ITEMS_PER_REGION = int(os.getenv("SUMMARY_ITEMS_PER_REGION", "8"))
 THEMES_MAX = int(os.getenv("THEMES_MAX", "3"))
 SEARCH_MAX_RESULTS = 10
+SEARCH_CONTEXT_SIZE = os.getenv("SEARCH_CONTEXT_SIZE", "low")  # web_search tool context: low | medium | high
 FETCH_TIMEOUT_SEC = 15
+FETCH_MAX_BYTES = int(os.getenv("FETCH_MAX_BYTES", "131072"))  # stop reading article HTML after this much
 MAX_WORKERS = 6
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "32"))  # article GETs in flight (network-bound, not LLM-bound)
+FETCH_PER_HOST = int(os.getenv("FETCH_PER_HOST", "4"))  # politeness cap per news site
+LABEL_FLUSH_SEC = 0.5  # streaming labeler: flush a partial micro-batch after this idle time
 
 MIN_CONTENT_CHARS_GLOBAL = int(os.getenv("MIN_CONTENT_CHARS_GLOBAL", "40"))
 MIN_CONTENT_CHARS_ID     = int(os.getenv("MIN_CONTENT_CHARS_ID", "40"))
@@ -28,7 +35,23 @@ GLOBAL_QUERY = ("You are a buy-side AI analyst focused on global and asia equiti
 LOCAL_QUERY  = ("You are a buy-side AI analyst focused on the Indonesian market. Compile high-importance market relevant news in the Indonesia region within the past 24 hours")
 # Behavior
 HEADLINE_ONLY_FOR_UTILITY = True
-CACHE_PATH = "outputs/model_cache.json"
+# Route labeling through the OpenAI Batch API (half price, minutes-to-hours turnaround)
+USE_BATCH_API = os.getenv("USE_BATCH_API", "0") == "1"
+BATCH_POLL_SEC = 15
+BATCH_MAX_WAIT_SEC = int(os.getenv("BATCH_MAX_WAIT_SEC", "3600"))
+CACHE_PATH = "outputs/model_cache.json"  # per-URL article cache (utils_cache)
+ARTICLE_FRESH_SEC = int(os.getenv("ARTICLE_FRESH_SEC", "3600"))  # reuse without any request
+ARTICLE_CACHE_KEEP_SEC = int(os.getenv("ARTICLE_CACHE_KEEP_SEC", str(7 * 86400)))  # revalidate until then
+LABEL_CACHE_PATH = os.getenv("LABEL_CACHE_PATH", "outputs/label_cache.sqlite")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "outputs/llm_cache.json")
+SEARCH_CACHE_TTL_SEC = int(os.getenv("SEARCH_CACHE_TTL_SEC", str(6 * 3600)))
+THEMES_CACHE_TTL_SEC = int(os.getenv("THEMES_CACHE_TTL_SEC", str(24 * 3600)))
+SUMMARY_CACHE_TTL_SEC = int(os.getenv("SUMMARY_CACHE_TTL_SEC", str(24 * 3600)))
+LLM_CACHE_KEEP_SEC = max(SEARCH_CACHE_TTL_SEC, THEMES_CACHE_TTL_SEC, SUMMARY_CACHE_TTL_SEC)  # older entries are pruned on write
+THEMES_SEMCACHE_PATH = os.getenv("THEMES_SEMCACHE_PATH", "outputs/themes_semcache.jsonl")
+THEMES_SEMCACHE_SIM = float(os.getenv("THEMES_SEMCACHE_SIM", "0.92"))  # cosine threshold for reuse
+MODEL_EMBED = os.getenv("OPENAI_MODEL_EMBED", "text-embedding-3-small")
+NEAR_DUP_SIM = float(os.getenv("NEAR_DUP_SIM", "0.85"))  # headline cosine above this = same story; 0 disables
 
 # Region detection
 BLACKLIST_DOMAINS = {"example.com"}
@@ -46,3 +69,7 @@ GICS_SECTORS = [
     "Energy","Materials","Industrials","Consumer Discretionary","Consumer Staples",
     "Health Care","Financials","Information Technology","Communication Services","Utilities","Real Estate"
 ]
+GICS_SECTORS_SET = frozenset(GICS_SECTORS)  # O(1) membership checks when validating model output
+
+SENTIMENTS = ["Positive", "Negative", "Neutral"]
+SENTIMENTS_SET = frozenset(SENTIMENTS)
@@ -6,33 +6,48 @@ LLM-grounded theme extraction with explicit grounding:
 - Falls back to trending-term heuristic if LLM fails.
 """
 
-import json
 import re
-import time
-import random
+import orjson
 from collections import Counter
 from typing import List, Dict
-from openai import OpenAI
-from .config import OPENAI_API_KEY, MODEL_REASON, THEMES_MAX
+from ._retry import call
+from ._util import read_json_stream
+from ._client import client
+from . import llm_cache, _theme_semcache
+from .config import MODEL_REASON, MODEL_EMBED, THEMES_MAX, THEMES_CACHE_TTL_SEC
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+__all__ = ["check_curated_watchlist", "find_dynamic_trends", "find_emerging_themes"]
 
 # --- Optional curated watchlist ---
 try:
-    with open("daily_brief/data/watchlist_curated.json") as f:
-        WATCHLIST_CURATED = json.load(f)
+    with open("daily_brief/data/watchlist_curated.json", "rb") as f:
+        WATCHLIST_CURATED = orjson.loads(f.read())
 except Exception:
     WATCHLIST_CURATED = []
 
 
+# One multi-keyword scan per item instead of one substring scan per (keyword, item).
+# The lookahead reports the longest keyword starting at each position; shorter keywords
+# starting there are its prefixes, credited via _PREFIXES, so every substring hit is found.
+_WATCH_KWS = sorted({kw.lower() for kw in WATCHLIST_CURATED if kw}, key=len, reverse=True)
+_WATCH_RE = re.compile("(?=(" + "|".join(map(re.escape, _WATCH_KWS)) + "))") if _WATCH_KWS else None
+_PREFIXES = {kw: [p for p in _WATCH_KWS if kw.startswith(p)] for kw in _WATCH_KWS}
+
+
 def check_curated_watchlist(items: List[Dict]) -> List[str]:
+    if _WATCH_RE is None:
+        return []
+    hits_by_kw = {}
+    for it in items:
+        text = (it.get("headline", "") + " " + it.get("content", "")).lower()
+        found = set()
+        for m in _WATCH_RE.finditer(text):
+            found.update(_PREFIXES[m.group(1)])
+        for kwl in found:
+            hits_by_kw.setdefault(kwl, []).append(it)
     alerts = []
     for kw in WATCHLIST_CURATED:
-        kwl = kw.lower()
-        hits = [
-            it for it in items
-            if kwl in (it.get("headline", "") + " " + it.get("content", "")).lower()
-        ]
+        hits = hits_by_kw.get(kw.lower())
         if hits:
             url = hits[0].get("url", "")
             if len(hits) == 1:
@@ -42,57 +57,85 @@ def check_curated_watchlist(items: List[Dict]) -> List[str]:
     return alerts
 
 
+_CAP_RE = re.compile(r"\b[A-Z][a-z]{3,}\b")
+_COMMON = frozenset({"The", "This", "That", "Market", "Global", "Today"})
+_CURATED_L = frozenset(w.lower() for w in WATCHLIST_CURATED)
+
+
 def find_dynamic_trends(items: List[Dict], top_n: int = 3) -> List[str]:
-    text = " ".join(it.get("headline", "") for it in items)
-    words = re.findall(r"\b[A-Z][a-z]{3,}\b", text)
-    freq = Counter(words)
-    curated = {w.lower() for w in WATCHLIST_CURATED}
-    common = {"The", "This", "That", "Market", "Global", "Today"}
+    # One pass: count capitalised tokens and remember the first URL each appears with
+    freq, first_url = Counter(), {}
+    for it in items:
+        words = _CAP_RE.findall(it.get("headline", ""))
+        freq.update(words)
+        for w in words:
+            first_url.setdefault(w, it.get("url", ""))
     trending = [
         w for w, c in freq.most_common(12)
-        if c > 1 and w.lower() not in curated and w not in common
+        if c > 1 and w.lower() not in _CURATED_L and w not in _COMMON
     ]
     out = []
     for term in trending[:top_n]:
-        url = next((it.get("url", "") for it in items if term in it.get("headline", "")), "")
+        url = first_url[term]
         out.append(f"{term}: Trending in news (mentioned {freq[term]} times) ({url})")
     return out
 
 
 # --- Helpers for LLM & enrichment ---
-def _backoff(call, *args, **kwargs):
-    delay = 0.35
-    for attempt in range(6):
-        try:
-            return call(*args, **kwargs)
-        except Exception:
-            if attempt == 5:
-                raise
-            time.sleep(delay + random.uniform(0, 0.25))
-            delay = min(delay * 2, 6.0)
-
-
-def _majority_region(indices: List[int], idx2item: Dict[int, Dict]) -> str:
-    counts = Counter(idx2item.get(i, {}).get("region", "Global") for i in indices if i in idx2item)
-    if not counts:
-        return "Mixed"
-    return counts.most_common(1)[0][0] or "Mixed"
-
-
-def _related_from_support(indices: List[int], idx2item: Dict[int, Dict], max_related=5) -> List[str]:
+# Support indices are 1-based positions into items, validated once by the caller
+def _majority_region(indices: List[int], items: List[Dict]) -> str:
+    counts = Counter(items[i - 1].get("region", "Global") for i in indices)
+    return (max(counts, key=counts.get) or "Mixed") if counts else "Mixed"
+
+
+def _related_from_support(indices: List[int], items: List[Dict], max_related=5) -> List[str]:
     titles = []
     for i in indices:
-        it = idx2item.get(i)
-        if not it:
-            continue
-        h = it.get("headline", "")
+        h = items[i - 1].get("headline", "")
         if h:
             titles.append(h)
-        if len(titles) >= max_related:
-            break
+            if len(titles) >= max_related:
+                break
     return titles
 
 
+def _valid_support(support, n: int) -> List[int]:
+    return [x for x in support or [] if isinstance(x, int) and 1 <= x <= n]
+
+
+def _embed_headlines(items: List[Dict]):
+    """Embedding of the joined headlines, or None on failure (the semantic cache is best-effort)."""
+    try:
+        resp = call(
+            client.embeddings.create,
+            model=MODEL_EMBED,
+            input="\n".join(it.get("headline", "") for it in items),
+        )
+        return resp.data[0].embedding
+    except Exception as e:
+        print(f"[themes] embed error: {type(e).__name__}")
+        return None
+
+
+def _support_to_headlines(themes: List[Dict], items: List[Dict]) -> List[Dict]:
+    # Indices are only meaningful for this run; persist the headlines they point at
+    return [
+        {**{k: v for k, v in t.items() if k != "support"},
+         "support_headlines": [items[x - 1].get("headline", "") for x in _valid_support(t.get("support"), len(items))]}
+        for t in themes
+    ]
+
+
+def _headlines_to_support(themes: List[Dict], items: List[Dict]) -> List[Dict]:
+    h2idx = {}
+    for i, it in enumerate(items, start=1):
+        h2idx.setdefault(it.get("headline", ""), i)
+    return [
+        {**t, "support": [h2idx[h] for h in t.get("support_headlines", []) if h in h2idx]}
+        for t in themes
+    ]
+
+
 def find_emerging_themes(items: List[Dict], max_themes: int = None) -> List[Dict]:
     """Return enriched themes: [{theme, description, region, priority, related_news}]"""
     if not items:
@@ -100,13 +143,11 @@ def find_emerging_themes(items: List[Dict], max_themes: int = None) -> List[Dict
     max_themes = max_themes or THEMES_MAX
 
     # Build compact, indexed context (1-based indices)
-    lines, idx2item = [], {}
-    for i, it in enumerate(items, start=1):
-        idx2item[i] = it
-        lines.append(
-            f"{i}. [{it.get('region','Global')}] {it.get('headline','')} "
-            f"({it.get('sector','Unknown')}, {it.get('sentiment','Neutral')})"
-        )
+    lines = [
+        f"{i}. [{it.get('region','Global')}] {it.get('headline','')} "
+        f"({it.get('sector','Unknown')}, {it.get('sentiment','Neutral')})"
+        for i, it in enumerate(items, start=1)
+    ]
 
     prompt = (
         "You are an equity research assistant. From the indexed headlines below, propose up to "
@@ -118,29 +159,53 @@ def find_emerging_themes(items: List[Dict], max_themes: int = None) -> List[Dict
     )
 
     out = []
-    # Try LLM JSON-mode
+    # Try LLM JSON-mode; identical headline sets reuse the cached raw answer
+    messages = [{"role": "user", "content": prompt}]
+    ck = llm_cache.key(MODEL_REASON, messages, response_format={"type": "json_object"})
     try:
-        resp = _backoff(
-            client.chat.completions.create,
-            model=MODEL_REASON,
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"},
-            max_completion_tokens=600,
-        )
-        print(f"[themes] resp_id={getattr(resp, 'id', None)} model={MODEL_REASON}")
-        raw = (resp.choices[0].message.content or "").strip()
-        data = json.loads(raw) if raw else {"themes": []}
+        raw = llm_cache.get(ck, THEMES_CACHE_TTL_SEC)
+        emb = _embed_headlines(items) if raw is None else None
+        near = _theme_semcache.lookup(emb, MODEL_REASON, max_themes) if emb else None
+        if near is not None:
+            # Near-duplicate headline set: reuse its themes, re-grounded on today's items. Headlines
+            # that changed drop out of support; if no theme keeps 2, the LLM does better than the hit
+            near = _headlines_to_support(near, items)
+            if not any(len(t["support"]) >= 2 for t in near):
+                print("[themes] semantic cache hit not grounded in today's items; calling the LLM")
+                near = None
+        if raw is not None:
+            print(f"[themes] cache hit model={MODEL_REASON}")
+            data = orjson.loads(raw)
+        elif near is not None:
+            print(f"[themes] semantic cache hit model={MODEL_REASON}")
+            data = {"themes": near}
+        else:
+            # Streamed so a malformed reply aborts on its first token instead of after full generation
+            stream = call(
+                client.chat.completions.create,
+                model=MODEL_REASON,
+                messages=messages,
+                response_format={"type": "json_object"},
+                max_completion_tokens=600,
+                stream=True,
+            )
+            raw, resp_id = read_json_stream(stream)
+            print(f"[themes] resp_id={resp_id} model={MODEL_REASON}")
+            raw = raw.strip()
+            data = orjson.loads(raw) if raw else {"themes": []}
+            if data.get("themes"):
+                llm_cache.put(ck, raw)
+                if emb:
+                    _theme_semcache.add(emb, _support_to_headlines(data["themes"], items),
+                                        MODEL_REASON, max_themes)
 
         for t in data.get("themes", []):
-            support = [
-                int(x) for x in t.get("support", [])
-                if isinstance(x, int) and x in idx2item
-            ]
+            support = _valid_support(t.get("support"), len(items))
             # Require >= 2 supporting headlines to avoid ungrounded themes
             if len(support) < 2:
                 continue
-            region = _majority_region(support, idx2item)
-            related = _related_from_support(support, idx2item)
+            region = _majority_region(support, items)
+            related = _related_from_support(support, items)
             priority = 1.0 if len(support) >= 4 else 0.7 if len(support) >= 3 else 0.5
             out.append({
                 "theme": (t.get("theme", "") or "").strip()[:140],
@@ -160,9 +225,9 @@ def find_emerging_themes(items: List[Dict], max_themes: int = None) -> List[Dict
     themes = []
     for tr in trends:
         term = tr.split(":")[0]
-        support_idx = [i for i, it in idx2item.items() if term in it.get("headline", "")]
-        region = _majority_region(support_idx, idx2item)
-        related = _related_from_support(support_idx, idx2item)
+        support_idx = [i for i, it in enumerate(items, start=1) if term in it.get("headline", "")]
+        region = _majority_region(support_idx, items)
+        related = _related_from_support(support_idx, items)
         themes.append({
             "theme": term,
             "description": f"Multiple headlines reference {term}.",
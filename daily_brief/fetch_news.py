@@ -1,38 +1,61 @@
 import os
 import sys
-import json
+import re
 import time
+import atexit
+import functools
+import importlib.util
+import asyncio
+import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context, get_all_start_methods
 from urllib.parse import urlparse, urljoin, urlunparse, parse_qsl, urlencode
-from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
 from datetime import datetime
 import openai
+from .config import (
+    OPENAI_API_KEY, GLOBAL_QUERY, LOCAL_QUERY, MAX_ARTICLES_TOTAL, SEARCH_MAX_RESULTS, SEARCH_CONTEXT_SIZE, MAX_WORKERS, FETCH_CONCURRENCY, FETCH_PER_HOST, FETCH_TIMEOUT_SEC, FETCH_MAX_BYTES, ARTICLE_FRESH_SEC,
+    MIN_CONTENT_CHARS_ID, ASIA_HINTS, INDONESIA_HINTS, SEARCH_CACHE_TTL_SEC, MODEL_EMBED, NEAR_DUP_SIM,
+    MIN_CONTENT_CHARS_GLOBAL as MIN_CONTENT_CHARS_BRIEF, BLACKLIST_DOMAINS as CONFIG_BLACKLIST_DOMAINS,
+)
 
-# Initialize OpenAI client (API key is expected in environment)
-api_key = os.getenv("OPENAI_API_KEY")
-if not api_key:
+__all__ = [
+    "fetch_all_news", "afetch_all_news", "perform_search", "fetch_article_content", "deduplicate_items",
+    "get_domain", "extract_source_name", "strip_tracking_params",
+]
+
+# Shared OpenAI client (API key is expected in environment)
+if not OPENAI_API_KEY:
     print("[fetch_news] ERROR: OpenAI API key not set in environment", file=sys.stderr)
     sys.exit(1)
-# Use the OpenAI Responses API client for tool use (web_search)
-from openai import OpenAI
-client = OpenAI(api_key=api_key)
+# Responses API is used for tool use (web_search)
+from ._client import client
+from ._retry import call
+from ._util import unit
+from . import llm_cache, utils_cache
 
 # Logging helper
 def log(message: str):
     """Print a log message with [fetch_news] prefix."""
     print(f"[fetch_news] {message}")
 
+# URL helpers are pure and hit several times per URL (blacklist, source name, dedupe), so memoized
 # Utility: normalize domain from URL
+@functools.lru_cache(maxsize=4096)
 def get_domain(url: str) -> str:
     """Return the base domain (without subdomains or port) from a URL."""
     try:
-        host = urlparse(url).netloc.lower()
-        return host.split(":")[0].replace("www.", "")
-    except Exception:
+        # .hostname is already lowercased and port-free
+        return (urlparse(url).hostname or "").removeprefix("www.")
+    except ValueError:
         return ""
 
 # Utility: short source name from URL
+@functools.lru_cache(maxsize=4096)
 def extract_source_name(url: str) -> str:
     """Extract a short source name from a URL (e.g., 'ft.com' -> 'Ft')."""
     domain = get_domain(url)
@@ -43,6 +66,7 @@ def extract_source_name(url: str) -> str:
     return core.capitalize()
 
 # Utility: remove tracking parameters (like utm_ queries) from URL
+@functools.lru_cache(maxsize=4096)
 def strip_tracking_params(url: str) -> str:
     """Remove common tracking query parameters (utm_*) from a URL."""
     try:
@@ -57,12 +81,23 @@ def strip_tracking_params(url: str) -> str:
 
 # Set default search parameters and thresholds
 MAX_RESULTS_PER_QUERY = 8  # max headlines to request per search query
-MAX_THREADS = 4            # for parallel content fetch
 # Minimum content length (characters) to keep article (global vs local regions)
 MIN_CONTENT_CHARS_GLOBAL = 100
 MIN_CONTENT_CHARS_LOCAL = 50
 # Domains to skip entirely (non-news or unwanted sources)
-BLACKLIST_DOMAINS = {"twitter.com", "facebook.com", "instagram.com", "youtube.com", "linkedin.com"}
+BLACKLIST_DOMAINS = {"twitter.com", "facebook.com", "instagram.com", "youtube.com", "linkedin.com"} | CONFIG_BLACKLIST_DOMAINS
+# Compiled once: matches a blacklisted domain or any subdomain of one (m.facebook.com, news.example.com)
+_BLACKLIST_RE = re.compile(r"(?:^|\.)(?:" + "|".join(map(re.escape, sorted(BLACKLIST_DOMAINS))) + r")$")
+
+def _is_blacklisted(url: str) -> bool:
+    return bool(_BLACKLIST_RE.search(get_domain(url)))
+
+# Region detection: whole-word hint matches (short hints like "bi"/"idx" must not hit inside words),
+# both hint sets in one alternation so a single scan classifies the text
+def _hints_alt(hints) -> str:
+    return "|".join(re.escape(h) for h in sorted(hints, key=len, reverse=True))
+
+_REGION_RE = re.compile(rf"\b(?:(?P<id>{_hints_alt(INDONESIA_HINTS)})|(?P<asia>{_hints_alt(ASIA_HINTS)}))\b")
 
 def perform_search(region_label: str, query: str, max_results: int):
     """
@@ -70,14 +105,22 @@ def perform_search(region_label: str, query: str, max_results: int):
     Returns a list of {'headline': ..., 'url': ...} results (up to max_results).
     Logs progress and errors according to conventions.
     """
+    model, prompt, tools = "gpt-5-mini", f"Give {max_results} recent reputable headlines for: {query}", [{"type": "web_search", "search_context_size": SEARCH_CONTEXT_SIZE}]
+    # Keyed per calendar day too: a run just after midnight must not serve yesterday's headlines
+    ck = llm_cache.key(model, prompt, tools=tools, day=datetime.now().date().isoformat())
+    cached = llm_cache.get(ck, SEARCH_CACHE_TTL_SEC)
+    if cached is not None:
+        log(f"{region_label}: web_search cache hit results={len(cached)}")
+        return cached
     log(f"{region_label}: web_search start")
     results = []
     try:
         # Call OpenAI Responses API with web_search tool
-        resp = client.responses.create(
-            model="gpt-5-mini",  # model supporting tools (could be parameterized)
-            input=f"Give {max_results} recent reputable headlines for: {query}",
-            tools=[{"type": "web_search"}]
+        resp = call(
+            client.responses.create,
+            model=model,  # model supporting tools (could be parameterized)
+            input=prompt,
+            tools=tools
         )
         # Log the response ID for traceability
         try:
@@ -85,18 +128,18 @@ def perform_search(region_label: str, query: str, max_results: int):
         except Exception:
             pass
         # Extract URL citations from the response
-        data = resp.model_dump() if hasattr(resp, "model_dump") else resp  # ensure it's a dict
-        for output in (data.get("output") or []):
-            for content_block in (output.get("content") or []):
-                for ann in (content_block.get("annotations") or []):
-                    if ann.get("type") == "url_citation":
-                        url = ann.get("url") or ""
-                        title = ann.get("title") or ""
+        # Walk the SDK objects directly; output items without content (e.g. web_search_call) are skipped
+        for output in (getattr(resp, "output", None) or []):
+            for content_block in (getattr(output, "content", None) or []):
+                for ann in (getattr(content_block, "annotations", None) or []):
+                    if getattr(ann, "type", None) == "url_citation":
+                        url = getattr(ann, "url", "") or ""
+                        title = getattr(ann, "title", "") or ""
                         if url and title:
                             # Filter out blacklisted domains early
-                            if get_domain(url) not in BLACKLIST_DOMAINS:
+                            if not _is_blacklisted(url):
                                 results.append({"headline": title, "url": url})
-    except openai.error.RateLimitError as e:
+    except openai.RateLimitError as e:
         # API rate limit reached
         log(f"{region_label}: web_search error -> RateLimitError")
         return None  # indicate a critical error for this region
@@ -109,83 +152,419 @@ def perform_search(region_label: str, query: str, max_results: int):
         # Other exceptions from OpenAI API call
         log(f"{region_label}: web_search error -> {type(e).__name__}")
         return []
-    # Log number of results (if any)
+    # Log number of results (if any); only non-empty results are cached
     if results:
         log(f"{region_label}: web_search results={len(results)}")
+        llm_cache.put(ck, results[:max_results])
     return results[:max_results]  # limit to max_results if more were returned
 
+_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                   "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0 Safari/537.36"),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.8"
+}
+
+_CONTENT_MAX = 2000  # chars of paragraph text kept per article
+_META_DESCRIPTIONS = (("name", "description"), ("property", "og:description"), ("name", "twitter:description"))
+
+def _pick_content(nodes) -> str:
+    """
+    One pass over (tag, text_fn, attrs) tuples in document order: paragraph text until _CONTENT_MAX
+    chars, remembering meta descriptions and the title on the way in case no paragraph has text.
+    """
+    paras, n, descs, title = [], 0, {}, None
+    for tag, text, attrs in nodes:
+        if tag == "p":
+            t = text()
+            if t:
+                paras.append(t)
+                n += len(t) + 1
+                if n >= _CONTENT_MAX:
+                    break
+        elif tag == "meta":
+            for key in _META_DESCRIPTIONS:
+                content = (attrs.get("content") or "").strip() if attrs.get(key[0]) == key[1] else ""
+                if content:
+                    descs.setdefault(key, content)
+        elif title is None:
+            title = text()
+    if paras:
+        return " ".join(paras).strip()[:_CONTENT_MAX]
+    # Fallback to meta descriptions (in priority order), then the page title
+    for key in _META_DESCRIPTIONS:
+        if key in descs:
+            return descs[key][:400]
+    return (title or "")[:200]
+
+# lxml's C tree builder when present, else the pure-Python html.parser
+_BS_FEATURES = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+def _bs4_content(html: str) -> str:
+    nodes = BeautifulSoup(html, _BS_FEATURES).find_all(["p", "meta", "title"])
+    return _pick_content((n.name, lambda n=n: n.get_text(" ", strip=True), n.attrs) for n in nodes)
+
+# Parser resolved once at import: selectolax (C, lexbor) when installed, else BeautifulSoup (lxml or html.parser).
+# selectolax >= 1.0 refuses to import its old Modest backend (selectolax.parser), so lexbor is named explicitly
+try:
+    from selectolax.lexbor import LexborHTMLParser
+
+    _FAST_PARSER = True  # ~0.4 ms per 50 KB page: cheaper inline than shipping the HTML to another process
+
+    def _content_from_html(html: str) -> str:
+        nodes = LexborHTMLParser(html).css("p, meta, title")
+        return _pick_content((n.tag, lambda n=n: n.text(separator=" ", strip=True), n.attributes) for n in nodes)
+except ImportError:
+    _FAST_PARSER = False
+    _content_from_html = _bs4_content
+
+# Persistent worker threads for blocking I/O inside the fetch loop (the web_search and embeddings
+# calls); reused across asyncio.run() calls instead of each loop's default executor
+_POOL = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="fetch")
+atexit.register(_POOL.shutdown, wait=False)
+
+async def _in_pool(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_POOL, fn, *args)
+
+# BeautifulSoup parsing is CPU-bound (~20 ms per 50 KB page even with lxml) and holds the GIL, stalling
+# the event loop's socket reads, so the fallback runs in worker processes (~0.3 ms IPC per page);
+# selectolax is fast enough to parse inline and never touches the pool. forkserver workers start from
+# a clean single-threaded server, never fork()ed from this process once _POOL threads are busy.
+def _new_parse_pool():
+    ctx = get_context("forkserver") if "forkserver" in get_all_start_methods() else None
+    pool = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) // 2), mp_context=ctx)
+    atexit.register(pool.shutdown, wait=False)
+    return pool
+
+# Started on the first BeautifulSoup parse, not at import: the forkserver and its workers import this
+# module too and must not start pools of their own
+_PARSE_POOL = None
+
+async def _parse(html: str) -> str:
+    global _PARSE_POOL
+    if _FAST_PARSER:
+        return _content_from_html(html)
+    if _PARSE_POOL is None:
+        _PARSE_POOL = _new_parse_pool()
+    pool = _PARSE_POOL
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, _bs4_content, html)
+    except BrokenProcessPool:
+        # A dead worker breaks the whole pool: the next page starts a fresh one, this one is parsed here
+        if _PARSE_POOL is pool:
+            log("parse pool broken; restarting")
+            _PARSE_POOL = None
+            pool.shutdown(wait=False)
+        return _bs4_content(html)
+
+# One pooled keep-alive session for the sync fetch path; sized like the aiohttp connector
+# (one pool per news host, FETCH_PER_HOST kept-alive connections each)
+_SESSION = requests.Session()
+_SESSION.headers.update(_HEADERS)
+_ADAPTER = HTTPAdapter(pool_connections=FETCH_CONCURRENCY, pool_maxsize=FETCH_PER_HOST)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+def _extract_content(item: dict, html: str) -> None:
+    """Set item['content'] (paragraphs, then meta description, then title) and item['source']."""
+    item["content"] = _content_from_html(html)
+    item["source"] = extract_source_name(item.get("url", ""))
+
+# Rough running count of paragraph text in a partly downloaded body, so the transfer can stop
+# as soon as the first _CONTENT_MAX chars are on hand; the real parse still runs afterwards
+_P_BLOCK_RE = re.compile(rb"<p[\s>].*?</p\s*>", re.I | re.S)
+_TAG_RE = re.compile(rb"<[^>]+>")
+
+class _Body:
+    """Accumulates body chunks; feed() returns True once enough has been read."""
+    def __init__(self):
+        self.buf, self.pos, self.text_len = bytearray(), 0, 0
+
+    def feed(self, chunk: bytes) -> bool:
+        self.buf += chunk
+        for m in _P_BLOCK_RE.finditer(self.buf, self.pos):
+            self.text_len += len(_TAG_RE.sub(b"", m.group()).strip())
+            self.pos = m.end()
+        # Byte count overestimates chars (entities, UTF-8), hence the margin
+        return len(self.buf) >= FETCH_MAX_BYTES or self.text_len >= _CONTENT_MAX * 5 // 4
+
+    def html(self, encoding) -> str:
+        return bytes(self.buf[:FETCH_MAX_BYTES]).decode(encoding or "utf-8", errors="replace")
+
+def _is_html(content_type: str) -> bool:
+    # PDFs, video and other binaries are skipped before any body bytes are read; a missing header is allowed
+    return not content_type or "html" in content_type.lower()
+
+def _use_cached(item: dict, url: str, cached: dict) -> dict:
+    item["content"], item["source"] = cached["content"], cached.get("source") or extract_source_name(url)
+    return item
+
+def _validators(cached: dict) -> dict:
+    """If-None-Match / If-Modified-Since headers for a cached article, so an unchanged page costs a bodiless 304."""
+    headers = {}
+    if cached.get("content"):
+        if cached.get("etag"): headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"): headers["If-Modified-Since"] = cached["last_modified"]
+    return headers
+
+def _is_fresh(cached: dict, now: float) -> bool:
+    return bool(cached.get("content")) and now - cached.get("fetched", 0) < ARTICLE_FRESH_SEC
+
 def fetch_article_content(item: dict) -> dict:
     """
     Fetch the article content for a given item (with 'url' and 'headline').
     Cleans the URL, fetches the page, extracts text, and adds 'content' and 'source'.
+    Uses the same per-URL article cache and conditional GET as the async path.
     Returns the updated item dict.
     """
     url = strip_tracking_params(item.get("url", ""))
     item["url"] = url  # update URL after stripping tracking parameters
+    cached, now = utils_cache.get(url), time.time()
+    if _is_fresh(cached, now):
+        return _use_cached(item, url, cached)
+    validators = _validators(cached)
     try:
-        r = requests.get(url, timeout=10, headers={
-            "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                           "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0 Safari/537.36"),
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.8"
-        })
-        if r.status_code != 200:
-            item["content"] = ""  # failed to retrieve content
-            return item
-        soup = BeautifulSoup(r.text, "html.parser")
-        # Try paragraphs first
-        paras = [p.get_text(" ", strip=True) for p in soup.find_all("p")]
-        text = " ".join(paras).strip()
-        if text:
-            item["content"] = text[:2000]  # take first 2000 chars of combined paragraphs
-        else:
-            # Fallback to meta descriptions
-            desc = ""
-            meta_tags = [
-                ("meta", {"name": "description"}),
-                ("meta", {"property": "og:description"}),
-                ("meta", {"name": "twitter:description"})
-            ]
-            for tag_name, attrs in meta_tags:
-                tag = soup.find(tag_name, attrs)
-                if tag and tag.get("content"):
-                    desc = tag["content"].strip()
-                    if desc:
-                        break
-            if desc:
-                item["content"] = desc[:400]
-            else:
-                # Last resort: page title
-                title_tag = soup.find("title")
-                item["content"] = title_tag.get_text(strip=True)[:200] if title_tag else ""
-        # Add source name from URL
-        item["source"] = extract_source_name(url)
+        with _SESSION.get(url, headers=validators, timeout=FETCH_TIMEOUT_SEC, stream=True) as r:
+            if r.status_code == 304 and validators:
+                _save_article_cache({url: {**cached, "fetched": now}})
+                return _use_cached(item, url, cached)
+            if r.status_code != 200 or not _is_html(r.headers.get("Content-Type", "")):
+                item["content"] = ""  # failed to retrieve content, or not a web page
+                return item
+            etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+            # Read only until enough paragraph text (or FETCH_MAX_BYTES) arrived; the rest is never downloaded
+            body = _Body()
+            for chunk in r.iter_content(16384):
+                if body.feed(chunk):
+                    break
+            # requests assumes ISO-8859-1 for text/* without a charset; like aiohttp's r.charset, only trust an explicit one
+            html = body.html(r.encoding if "charset=" in r.headers.get("Content-Type", "").lower() else None)
+        _extract_content(item, html)
+        if item["content"]:
+            _save_article_cache({url: {"content": item["content"], "source": item["source"], "etag": etag,
+                                       "last_modified": last_modified, "fetched": now}})
     except Exception:
         # On any exception (request timeout, parse error, etc.), mark content empty
         item["content"] = ""
     return item
 
+async def _afetch_article_content(session: aiohttp.ClientSession, sem: asyncio.Semaphore, item: dict,
+                                  updates: dict) -> dict:
+    """
+    Async counterpart of fetch_article_content; HTML parsing runs off the event loop.
+    Extracted content is cached per URL: reused outright while fresh, otherwise revalidated
+    with a conditional GET. New cache entries are collected in updates for one write per run.
+    """
+    url = strip_tracking_params(item.get("url", ""))
+    item["url"] = url
+    cached, now = utils_cache.get(url), time.time()
+    if _is_fresh(cached, now):
+        return _use_cached(item, url, cached)
+    validators = _validators(cached)
+    try:
+        async with sem, session.get(url, headers=validators) as r:
+            if r.status == 304 and validators:
+                updates[url] = {**cached, "fetched": now}
+                return _use_cached(item, url, cached)
+            if r.status != 200 or not _is_html(r.headers.get("Content-Type", "")):
+                item["content"] = ""
+                return item
+            etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+            body = _Body()
+            async for chunk in r.content.iter_chunked(16384):
+                if body.feed(chunk):
+                    break  # the rest is never downloaded; the connection is closed, not drained
+            html = body.html(r.charset)
+        item["content"], item["source"] = await _parse(html), extract_source_name(url)
+        if item["content"]:
+            updates[url] = {"content": item["content"], "source": item["source"], "etag": etag,
+                            "last_modified": last_modified, "fetched": now}
+    except Exception:
+        item["content"] = ""
+    return item
+
 def deduplicate_items(items: list, max_items: int = None) -> list:
     """
     Deduplicate the list of news item dicts by URL + headline.
     Preserve order of first occurrence. If max_items is given, limit the output list to that many items.
     """
-    seen_keys = set()
-    unique_items = []
+    unique = {}  # insertion-ordered, so first occurrence wins
     for it in items:
-        key = (it.get("url", ""), (it.get("headline", "") or "").strip().lower())
-        if key in seen_keys:
-            continue
-        seen_keys.add(key)
-        unique_items.append(it)
-        if max_items and len(unique_items) >= max_items:
+        unique.setdefault((it.get("url", ""), (it.get("headline", "") or "").strip().lower()), it)
+        if max_items and len(unique) >= max_items:
             break
-    return unique_items
+    return list(unique.values())
+
+def _detect_region(item: dict) -> str:
+    """Classify an item as Indonesia / Asia / Global from its headline and content."""
+    if get_domain(item.get("url", "")).endswith(".id"):
+        return "Indonesia"  # Indonesian outlet (.co.id, .go.id, ...): no text scan needed
+    blob = (item.get("headline", "") + " " + item.get("content", "")).lower()
+    region = "Global"
+    for m in _REGION_RE.finditer(blob):
+        if m.lastgroup == "id":
+            return "Indonesia"  # any Indonesia hint wins over Asia ones
+        region = "Asia"
+    return region
+
+def _canonical(url: str) -> str:
+    """Dedupe key for a tracking-stripped URL: lowercase scheme/host, no fragment, no trailing slash."""
+    try:
+        p = urlparse(url)
+    except ValueError:
+        return url
+    return urlunparse((p.scheme.lower(), p.netloc.lower(), p.path.rstrip("/"), p.params, p.query, ""))
+
+def _dedupe_urls(raw: list, seen: set) -> list:
+    """
+    Normalize URLs and drop blacklisted domains and URLs whose canonical form is already in seen
+    (shared across regions), preserving order; runs before any article request is made.
+    """
+    out = []
+    for it in raw:
+        url = strip_tracking_params(it.get("url", ""))
+        key = _canonical(url)
+        if url and key not in seen and not _is_blacklisted(url):
+            seen.add(key)
+            it["url"] = url
+            out.append(it)
+    return out
+
+def _embed_headlines(raw: list):
+    """Unit-norm headline embeddings (blocking call); None when the near-dup filter is off or the call fails."""
+    if NEAR_DUP_SIM <= 0 or not raw:
+        return None
+    try:
+        resp = call(client.embeddings.create, model=MODEL_EMBED, dimensions=256,
+                    input=[it.get("headline", "") or " " for it in raw])
+    except Exception as e:
+        log(f"near-dup filter skipped -> {type(e).__name__}")
+        return None
+    return [unit(d.embedding) for d in resp.data]
+
+def _drop_near_duplicates(raw: list, vecs, kept_vecs: list) -> list:
+    """
+    Greedily keep headlines whose embedding cosine to every kept one (kept_vecs, shared across
+    regions and extended in place) is below NEAR_DUP_SIM, so "Fed hikes rates" and "Federal Reserve
+    raises interest rates" cost one fetch, not two. Order is preserved; without vecs raw is returned as is.
+    """
+    if vecs is None:
+        return raw
+    kept = []
+    for it, v in zip(raw, vecs):
+        if all(sum(a * b for a, b in zip(v, k)) < NEAR_DUP_SIM for k in kept_vecs):
+            kept.append(it)
+            kept_vecs.append(v)
+    if len(kept) < len(raw):
+        log(f"near-dup filter dropped {len(raw) - len(kept)}/{len(raw)}")
+    return kept
+
+async def _retrieve(session: aiohttp.ClientSession, sem: asyncio.Semaphore, updates: dict, region_label: str,
+                    raw: list, force_indonesia: bool, admitted: list, on_item=None) -> list:
+    """
+    Fetch one region's article bodies concurrently and keep items with enough content.
+    Each kept item is tagged with a brief region (Global/Asia/Indonesia) and admitted into the
+    run-wide admitted list (shared across regions) until it holds MAX_ARTICLES_TOTAL; only admitted
+    items are returned and, if given, passed to on_item(item) as soon as their fetch completes,
+    so callers never start work on an article the brief would drop.
+    """
+    if not raw:
+        log(f"{region_label}: no URLs")
+        return []
+    min_chars = MIN_CONTENT_CHARS_ID if force_indonesia else MIN_CONTENT_CHARS_BRIEF
+
+    async def fetch_and_keep(item):
+        if len(admitted) >= MAX_ARTICLES_TOTAL:
+            return None  # budget already filled: skip the request entirely
+        item = await _afetch_article_content(session, sem, item, updates)
+        content = (item.get("content") or "").strip()
+        if len(content) < min_chars or len(admitted) >= MAX_ARTICLES_TOTAL:
+            return None
+        item["region"] = "Indonesia" if force_indonesia else _detect_region(item)
+        admitted.append(item)
+        if on_item:
+            on_item(item)
+        return item
+
+    kept = [it for it in await asyncio.gather(*[fetch_and_keep(it) for it in raw]) if it]  # search order
+    log(f"{region_label}: kept {len(kept)}/{len(raw)}")
+    return kept
+
+async def _warm_hosts(session: aiohttp.ClientSession, raw: list, warmed: set) -> None:
+    """HEAD each not-yet-seen host once so DNS, TCP and TLS are done before the article GETs."""
+    origins, now = set(), time.time()
+    for it in raw:
+        url = it.get("url", "")
+        if _is_fresh(utils_cache.get(url), now):
+            continue  # served from cache, no connection needed
+        p = urlparse(url)
+        if p.scheme in ("http", "https") and p.hostname and (p.scheme, p.hostname) not in warmed:
+            warmed.add((p.scheme, p.hostname))
+            origins.add(f"{p.scheme}://{p.hostname}/")
+
+    async def head(origin):
+        try:
+            async with session.head(origin, allow_redirects=False, timeout=aiohttp.ClientTimeout(total=3)):
+                pass  # the pooled keep-alive connection is what we want
+        except Exception:
+            pass
+
+    await asyncio.gather(*[head(o) for o in origins])
+
+def _session() -> aiohttp.ClientSession:
+    """One session per run: keep-alive pool with a per-host cap plus cached DNS."""
+    connector = aiohttp.TCPConnector(limit=FETCH_CONCURRENCY, limit_per_host=FETCH_PER_HOST, ttl_dns_cache=300)
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=FETCH_TIMEOUT_SEC),
+                                 headers=_HEADERS)
+
+def _save_article_cache(updates: dict) -> None:
+    try:
+        utils_cache.set_many(updates)
+    except OSError as e:
+        log(f"article cache write error -> {type(e).__name__}")
+
+async def _afetch_many(items: list) -> list:
+    """Fetch content for items concurrently (CLI path); returns them in input order."""
+    sem, updates = asyncio.Semaphore(FETCH_CONCURRENCY), {}
+    async with _session() as session:
+        out = await asyncio.gather(*[_afetch_article_content(session, sem, it, updates) for it in items])
+    _save_article_cache(updates)
+    return out
+
+async def afetch_all_news(on_item=None) -> list:
+    """
+    Fetch Global/Asia and Indonesia news on the running loop as a pipeline: each region's articles
+    start downloading as soon as its own search returns, while the other search may still be running.
+    At most MAX_ARTICLES_TOTAL articles are kept, first come first served across regions, and
+    on_item(item) is called for exactly those.
+    """
+    sem, updates, seen, kept_vecs, admitted = asyncio.Semaphore(FETCH_CONCURRENCY), {}, set(), [], []
+    warmed, warm_tasks = set(), []
+    async with _session() as session:
+
+        async def region(region_label, query, force_indonesia):
+            # Blocking Responses API call, so off the loop
+            raw = await _in_pool(perform_search, region_label, query, SEARCH_MAX_RESULTS) or []
+            # Drop what the other region already claimed (same URL, then same story): the embeddings
+            # call runs in the pool on the sync client, the filter itself on the loop so it never races
+            raw = _dedupe_urls(raw, seen)
+            if NEAR_DUP_SIM > 0:
+                # The embeddings round-trip is dead time for the network: warm this region's hosts
+                # (connector DNS cache, pooled TCP/TLS) meanwhile; without it, warming would only race the GETs
+                warm_tasks.append(asyncio.create_task(_warm_hosts(session, raw, warmed)))
+            raw = _drop_near_duplicates(raw, await _in_pool(_embed_headlines, raw), kept_vecs)
+            return await _retrieve(session, sem, updates, region_label, raw, force_indonesia, admitted, on_item)
+
+        global_items, local_items = await asyncio.gather(
+            region("GLOBAL/ASIA", GLOBAL_QUERY, False), region("INDONESIA", LOCAL_QUERY, True)
+        )
+        await asyncio.gather(*warm_tasks)
+    _save_article_cache(updates)
+    return global_items + local_items  # already capped by the shared admission budget
 
-def fetch_all_news() -> list:
-    global_items = _search_and_retrieve("GLOBAL/ASIA", GLOBAL_QUERY, force_indonesia=False)
-    local_items = _search_and_retriev("INDONESIA", LOCAL_QUERY, force_indonesia=True)
-    return all_items
+def fetch_all_news(on_item=None) -> list:
+    """Sync entrypoint for afetch_all_news."""
+    return asyncio.run(afetch_all_news(on_item))
 
 def main():
     # Determine regions and queries from CLI or config
@@ -199,8 +578,8 @@ def main():
     if config_path:
         # Load regions from JSON file
         try:
-            with open(config_path, 'r') as f:
-                data = json.load(f)
+            with open(config_path, 'rb') as f:
+                data = orjson.loads(f.read())
         except Exception as e:
             log(f"ERROR: Failed to load config file '{config_path}' -> {type(e).__name__}")
             sys.exit(1)
@@ -266,17 +645,16 @@ def main():
             log(f"{region_name}: no URLs")
             region_original_counts[region_name] = 0
             continue
-        # Deduplicate region_items (in case multiple queries yielded same link)
-        region_items = deduplicate_items(region_items)
-        # Fetch content for all region items in parallel (limited by MAX_THREADS)
-        with ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
-            fetched_items = list(executor.map(fetch_article_content, region_items))
+        # Deduplicate region_items by canonical URL (multiple queries / tracker variants of one link)
+        region_items = _dedupe_urls(region_items, set())
+        # Fetch content for all region items concurrently on one event loop
+        fetched_items = asyncio.run(_afetch_many(region_items))
         # Filter out items with blacklisted domains or too-short content
         filtered_items = []
         for item in fetched_items:
             url = item.get("url", "")
             # Skip if domain is blacklisted (additional check in case some slipped through)
-            if get_domain(url) in BLACKLIST_DOMAINS:
+            if _is_blacklisted(url):
                 continue
             content = (item.get("content") or "").strip()
             if not content:
@@ -326,7 +704,8 @@ def main():
             region_entry["queries"] = queries
         output["regions"].append(region_entry)
     # Print the final JSON output
-    print(json.dumps(output, ensure_ascii=False, indent=2))
+    sys.stdout.flush()  # log lines above go through the text layer; keep them ahead of the JSON
+    sys.stdout.buffer.write(orjson.dumps(output, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
     
 if __name__ == "__main__":
     main()
@@ -4,68 +4,103 @@ Compose with LLM reasoning for summaries + deterministic JSON:
 - JSON is built only from fetched items (no fabricated URLs).
 - Markdown rendered locally.
 """
-import json, time, random
+import io
+from functools import lru_cache
+import orjson
+from collections import Counter
 from typing import Dict, List
 from urllib.parse import urlparse
-from openai import OpenAI
-from .config import OPENAI_API_KEY, MODEL_REASON, MAX_COMPLETION_TOKENS, SUMMARY_ITEMS_PER_REGION
+from ._retry import call
+from ._client import client
+from ._util import read_json_stream
+from . import _batch, llm_cache
+from .config import (MODEL_REASON, MAX_COMPLETION_TOKENS, SUMMARY_ITEMS_PER_REGION, USE_BATCH_API,
+                     SUMMARY_CACHE_TTL_SEC)
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+__all__ = ["compose_and_generate", "summarize_regions"]
 
+@lru_cache(maxsize=4096)  # many items share a source domain
 def _host(url: str) -> str:
     try:
-        h = urlparse(url).netloc.replace("www.", "").split(":")[0]
-        return h or "source"
-    except Exception:
+        return (urlparse(url).hostname or "").removeprefix("www.") or "source"
+    except ValueError:
         return "source"
 
+def _counts(items: List[Dict]):
+    c = Counter(it.get("sentiment") for it in items)  # one pass; unlabeled items count for none
+    return c["Positive"], c["Negative"], c["Neutral"]
+
 def _fallback_summary(items: List[Dict], label: str) -> str:
-    pos = sum(1 for it in items if it.get("sentiment") == "Positive")
-    neg = sum(1 for it in items if it.get("sentiment") == "Negative")
-    neu = sum(1 for it in items if it.get("sentiment") == "Neutral")
+    pos, neg, neu = _counts(items)
     return f"{label} headlines: {len(items)} items (Positive {pos}, Negative {neg}, Neutral {neu})."
 
 def _partition_by_region(all_items: List[Dict]):
-    indo = [it for it in all_items if it.get("region") == "Indonesia"]
-    asia = [it for it in all_items if it.get("region") == "Asia"]
-    glob = [it for it in all_items if it.get("region") == "Global"]
+    glob, asia, indo = [], [], []
+    bucket = {"Global": glob, "Asia": asia, "Indonesia": indo}
+    for it in all_items:  # one pass; items with any other region are left out, as before
+        b = bucket.get(it.get("region"))
+        if b is not None: b.append(it)
     return glob, asia, indo
 
-def _backoff(call, *args, **kwargs):
-    delay = 0.35
-    for attempt in range(5):
-        try:
-            return call(*args, **kwargs)
-        except Exception:
-            if attempt == 4:
-                raise
-            time.sleep(delay + random.uniform(0,0.25))
-            delay = min(delay*2, 5.0)
+# Fixed instructions first, byte-identical every run, so the provider's prefix cache can reuse them;
+# only the day's bullets vary, in the user message
+_SUMMARY_SYSTEM = (
+    "Write concise, factual summaries (1–2 sentences each) for Global, Asia, and Indonesia "
+    "**based only on** the bullets in the user message. Do not invent facts.\n"
+    "Return JSON keys: global, asia, indonesia."
+)
+# Strict structured output: the server guarantees all three keys as strings
+_SUMMARY_FORMAT = {"type": "json_schema", "json_schema": {"name": "region_summaries", "strict": True, "schema": {
+    "type": "object",
+    "properties": {k: {"type": "string"} for k in ("global", "asia", "indonesia")},
+    "required": ["global", "asia", "indonesia"],
+    "additionalProperties": False,
+}}}
+
+_HEADLINE_MAX = 240  # chars per bullet; long search titles add input tokens, not substance
 
 def _summarize_regions_with_llm(glob, asia, indo) -> Dict[str,str]:
-    def _fmt(items):
-        return "\n".join(
-            f"- [{it.get('sector','Unknown')}/{it.get('sentiment','Neutral')}] {it.get('headline','')}"
+    if max(len(glob), len(asia), len(indo)) < 2:
+        # A single headline per region says no more than the counts line: skip the round-trip
+        return {
+            "global": _fallback_summary(glob, "Global"),
+            "asia": _fallback_summary(asia, "Asia"),
+            "indonesia": _fallback_summary(indo, "Indonesia"),
+        }
+    def _fmt(label, items):
+        # Sentiment tallies up front so the model can state the tone without counting bullets itself
+        head = "%s (Positive/Negative/Neutral = %d/%d/%d):" % (label, *_counts(items))
+        return head + "\n" + ("\n".join(
+            f"- [{it.get('sector','Unknown')}/{it.get('sentiment','Neutral')}] {it.get('headline','')[:_HEADLINE_MAX]}"
             for it in items[:SUMMARY_ITEMS_PER_REGION]
-        ) or "(no items)"
-
-    prompt = (
-        "Write concise, factual summaries (1–2 sentences each) for Global, Asia, and Indonesia "
-        "**based only on** the bullets below. Do not invent facts.\n"
-        'Return ONLY JSON: {"global":"…","asia":"…","indonesia":"…"}\n\n'
-        f"Global:\n{_fmt(glob)}\n\nAsia:\n{_fmt(asia)}\n\nIndonesia:\n{_fmt(indo)}\n"
-    )
+        ) or "(no items)")
+
+    bullets = f"{_fmt('Global', glob)}\n\n{_fmt('Asia', asia)}\n\n{_fmt('Indonesia', indo)}\n"
+    body = {
+        "model": MODEL_REASON,
+        "messages": [{"role":"system","content": _SUMMARY_SYSTEM}, {"role":"user","content": bullets}],
+        "response_format": _SUMMARY_FORMAT,
+        "max_completion_tokens": 350,
+    }
+    # Same bullets (e.g. a re-run on the same items) -> same summaries, no model call
+    ck = llm_cache.key(MODEL_REASON, body["messages"], response_format=body["response_format"])
     try:
-        r = _backoff(
-            client.chat.completions.create,
-            model=MODEL_REASON,
-            messages=[{"role":"user","content": prompt}],
-            response_format={"type":"json_object"},
-            max_completion_tokens=350,
-        )
-        print(f"[summary] resp_id={getattr(r,'id',None)} model={MODEL_REASON}")
-        txt = (r.choices[0].message.content or "").strip()
-        data = json.loads(txt) if txt else {}
+        data = llm_cache.get(ck, SUMMARY_CACHE_TTL_SEC)
+        if data is not None:
+            print(f"[summary] cache hit model={MODEL_REASON}")
+        else:
+            # Scheduled runs can take the Batch API's turnaround for half the price; real-time call otherwise
+            out = _batch.run({"summary": body}, tag="summary") if USE_BATCH_API else None
+            if out and "summary" in out:
+                txt = out["summary"]["choices"][0]["message"].get("content") or ""
+            else:
+                # Streamed: reading stops as soon as the JSON object closes
+                txt, resp_id = read_json_stream(call(client.chat.completions.create, **body, stream=True))
+                print(f"[summary] resp_id={resp_id} model={MODEL_REASON}")
+            # orjson skips surrounding whitespace itself; only a blank reply needs the guard
+            data = orjson.loads(txt) if txt and not txt.isspace() else {}
+            if any(data.get(k) for k in ("global", "asia", "indonesia")):
+                llm_cache.put(ck, data)
         g = data.get("global")
         a = data.get("asia")
         i = data.get("indonesia")
@@ -83,64 +118,69 @@ def _summarize_regions_with_llm(glob, asia, indo) -> Dict[str,str]:
             "indonesia": _fallback_summary(indo, "Indonesia"),
         }
 
-def _render_markdown(brief_json: dict) -> str:
-    lines = []
-    lines.append(f"# Morning Market Brief — {brief_json.get('date','')}")
-    lines.append("")
+def summarize_regions(all_items: List[Dict]) -> Dict[str,str]:
+    """Global/Asia/Indonesia summaries (one LLM call, counts-only fallback); blocking, thread-safe."""
+    return _summarize_regions_with_llm(*_partition_by_region(all_items))
+
+_ITEM_MD = "- [%(region)s] %(headline)s (%(sentiment)s) — [%(source)s](%(url)s)\n"
+
+def _sectors_markdown(news_by_sector: dict) -> str:
+    buf = io.StringIO()
+    w = buf.write
+    for sector, items in news_by_sector.items():
+        w(f"### {sector}\n")
+        if not items:
+            w("- None\n")
+        for it in items:
+            w(_ITEM_MD % {"region": it.get("region", "Global"), "headline": it.get("headline", ""),
+                          "sentiment": it.get("sentiment", "Neutral"), "source": it.get("source", "source"),
+                          "url": it.get("url", "")})
+        w("\n")
+    return buf.getvalue()
+
+def _render_markdown(brief_json: dict, sectors_md: str = None) -> str:
+    """sectors_md: the News by Sector body if already rendered (compose builds it with the JSON)."""
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# Morning Market Brief — {brief_json.get('date','')}\n\n")
     ms = brief_json.get("market_summaries", {})
-    lines.append("## Market Summaries")
-    lines.append(f"- **Global:** {ms.get('global','')}")
-    lines.append(f"- **Asia:** {ms.get('asia','')}")
-    lines.append(f"- **Indonesia:** {ms.get('indonesia','')}")
-    lines.append("")
-    lines.append("## Economic Events")
+    w("## Market Summaries\n")
+    w(f"- **Global:** {ms.get('global','')}\n")
+    w(f"- **Asia:** {ms.get('asia','')}\n")
+    w(f"- **Indonesia:** {ms.get('indonesia','')}\n\n")
+    w("## Economic Events\n")
     evs = brief_json.get("economic_events", []) or []
     if evs:
         for e in evs:
             imp = f" — {e.get('impact','')}" if e.get("impact") else ""
-            lines.append(f"- {e.get('event','')}{imp}")
+            w(f"- {e.get('event','')}{imp}\n")
     else:
-        lines.append("- None")
-    lines.append("")
-    lines.append("## News by Sector")
-    nbs = brief_json.get("news_by_sector", {}) or {}
-    for sector, items in nbs.items():
-        lines.append(f"### {sector}")
-        if not items:
-            lines.append("- None")
-        else:
-            for it in items:
-                reg = it.get("region", "Global")
-                snt = it.get("sentiment", "Neutral")
-                src = it.get("source", "source")
-                url = it.get("url", "")
-                headline = it.get("headline", "")
-                lines.append(f"- [{reg}] {headline} ({snt}) — [{src}]({url})")
-        lines.append("")
-    lines.append("")
-    lines.append("## Watchlist Alerts")
+        w("- None\n")
+    w("\n## News by Sector\n")
+    if sectors_md is None:
+        sectors_md = _sectors_markdown(brief_json.get("news_by_sector", {}) or {})
+    w(sectors_md or "\n")  # each sector block already ends with a blank line
+    w("## Watchlist Alerts\n")
     alerts = brief_json.get("watchlist_alerts", []) or []
     if alerts:
         for a in alerts:
             base = a.get("alert", "")
             ref = a.get("reference_url")
             if ref:
-                lines.append(f"- {base} — [source]({ref})")
+                w(f"- {base} — [source]({ref})\n")
             else:
-                lines.append(f"- {base}")
+                w(f"- {base}\n")
     else:
-        lines.append("- None")
-    lines.append("")
-    lines.append("## Emerging Themes")
+        w("- None\n")
+    w("\n## Emerging Themes\n")
     themes = brief_json.get("emerging_themes", []) or []
     if themes:
         for t in themes:
             reg = f" [{t.get('region')}]" if t.get("region") else ""
-            lines.append(f"- **{t.get('theme','')}**{reg}: {t.get('description','')}")
+            w(f"- **{t.get('theme','')}**{reg}: {t.get('description','')}\n")
     else:
-        lines.append("- None")
-    lines.append("")
-    return "\n".join(lines)
+        w("- None\n")
+    return buf.getvalue()
 
 def compose_and_generate(
     date: str,
@@ -151,13 +191,13 @@ def compose_and_generate(
     emerging_themes: list,
     sentiment_indicators: dict,
 ) -> tuple:
-    # Flatten all items for summaries
-    all_items = []
-    for items in news_by_sector.values():
-        all_items.extend(items)
-    # LLM summaries with fallback
-    g, a, i = _partition_by_region(all_items)
-    ms = _summarize_regions_with_llm(g, a, i)
+    # LLM summaries with fallback, unless the caller already produced them (e.g. alongside themes)
+    ms = market_summaries
+    if not ms:
+        all_items = []
+        for items in news_by_sector.values():
+            all_items.extend(items)
+        ms = summarize_regions(all_items)
 
     # Deterministic JSON (only fetched items)
     brief_json = {
@@ -170,11 +210,16 @@ def compose_and_generate(
         "sentiment_indicators": sentiment_indicators or {},
     }
 
+    # One pass per item: normalize it for the JSON and write its Markdown line from the result
+    md = io.StringIO()
     for sector, items in news_by_sector.items():
+        md.write(f"### {sector}\n")
+        if not items:
+            md.write("- None\n")
         out = []
         for it in items:
             url = it.get("url", "")
-            out.append({
+            norm = {
                 "headline":  it.get("headline", ""),
                 "source":    it.get("source") or _host(url),
                 "url":       url,
@@ -182,8 +227,11 @@ def compose_and_generate(
                 "sentiment": it.get("sentiment", "Neutral"),
                 "priority":  it.get("priority", 0),
                 "theme":     it.get("theme", "")
-            })
+            }
+            out.append(norm)
+            md.write(_ITEM_MD % norm)
+        md.write("\n")
         brief_json["news_by_sector"][sector] = out
 
-    brief_md = _render_markdown(brief_json)
+    brief_md = _render_markdown(brief_json, md.getvalue())
     return brief_json, brief_md
@@ -0,0 +1,152 @@
+"""Fused sentiment + GICS sector labeling: one strict-schema LLM call per batch."""
+import sys
+import asyncio
+from typing import List, Literal
+from pydantic import BaseModel, ConfigDict
+from . import _label_cache, _local_labels
+from ._client import aclient
+from ._util import batches, batch_size, max_tokens_for, acall_shaped
+from .config import (MODEL_UTILITY, MAX_WORKERS, LABEL_FLUSH_SEC, GICS_SECTORS,
+                     SENTIMENTS, HEADLINE_ONLY_FOR_UTILITY)
+
+__all__ = ["abatch_assign_labels", "batch_assign_labels", "alabel_stream", "COMBINED_SCHEMA", "LabelMap", "SENTIMENTS"]
+
+class HeadlineLabel(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    i: int
+    sentiment: Literal[tuple(SENTIMENTS)]
+    sector: Literal[tuple(GICS_SECTORS)]
+
+class LabelMap(BaseModel):
+    """Structured-output contract for the fused call; the SDK validates enums for us."""
+    model_config = ConfigDict(extra="forbid")
+    mapping: List[HeadlineLabel]
+
+# Same contract as raw JSON schema, for request bodies we serialize ourselves (Batch API)
+COMBINED_SCHEMA = {"name": "headline_labels", "strict": True, "schema": LabelMap.model_json_schema()}
+
+# Stable few-shot examples shared by every labeling prompt: (headline, sentiment, sector)
+EXAMPLES = [
+    ("Brent crude jumps as OPEC+ extends output cuts", "Positive", "Energy"),
+    ("Nickel prices slump to two-year low on Indonesian supply glut", "Negative", "Materials"),
+    ("Bank Indonesia holds benchmark rate, in line with expectations", "Neutral", "Financials"),
+    ("TSMC shares slide after weaker smartphone chip orders", "Negative", "Information Technology"),
+    ("Unilever Indonesia raises dividend as margins recover", "Positive", "Consumer Staples"),
+    ("Toyota trims full-year profit forecast on strong yen", "Negative", "Consumer Discretionary"),
+    ("Telkom Indonesia outlines data-centre spin-off timeline", "Neutral", "Communication Services"),
+    ("China developers rally after new mortgage easing measures", "Positive", "Real Estate"),
+]
+
+# Built once at import: byte-identical across calls so the cached prefix is reused
+SYSTEM_PREFIX = (
+    "You label equity-market news headlines.\n"
+    "For each numbered headline, assign sentiment strictly as one of: Positive, Negative, Neutral, "
+    "and exactly one GICS sector from this set:\n"
+    + ", ".join(sorted(GICS_SECTORS)) + "\n\n"
+    'Return {"mapping":[{"i": <absolute_index>, "sentiment": "<sentiment>", "sector": "<sector>"}]}\n'
+    "Use <absolute_index> as the 1-based index shown before each headline.\n\n"
+    "Examples:\n"
+    + "\n".join(f"- {h} => sentiment={snt}, sector={sec}" for h, snt, sec in EXAMPLES)
+)
+
+# Resolved once at import rather than branching on HEADLINE_ONLY_FOR_UTILITY per item
+if HEADLINE_ONLY_FOR_UTILITY:
+    def _item_text(item: dict) -> str:
+        return item.get("headline","")
+else:
+    def _item_text(item: dict) -> str:
+        return item.get("headline","") + " " + item.get("content","")[:160]
+
+def _headline_lines(items: list, group: list) -> str:
+    # Items without a headline cannot be classified; they keep the Neutral/Unknown defaults
+    return "\n".join(f"{i+1}. {_item_text(items[i])}" for i in group if items[i].get("headline"))
+
+def _build_messages(items: list, group: list) -> list:
+    # Static instructions first so OpenAI's prefix cache can reuse them across chunks and runs
+    return [
+        {"role": "system", "content": SYSTEM_PREFIX},
+        {"role": "user", "content": _headline_lines(items, group)},
+    ]
+
+def _apply_mapping(items: list, group: list, labels: LabelMap) -> list:
+    """Write labels for indices in group; return the indices actually labeled."""
+    allowed, done = set(group), []
+    for m in labels.mapping:
+        idx = m.i - 1
+        if idx in allowed:
+            # Interned: a handful of label values repeat across every item, compared and hashed downstream
+            items[idx]["sentiment"] = sys.intern(m.sentiment)
+            items[idx]["sector"] = sys.intern(m.sector)
+            done.append(idx)
+    return done
+
+async def _label_group(items: list, group: list, sem: asyncio.Semaphore) -> None:
+    async with sem:
+        resp = await acall_shaped(
+            aclient().chat.completions.with_raw_response.parse,
+            model=MODEL_UTILITY,
+            messages=_build_messages(items, group),
+            response_format=LabelMap,
+            max_completion_tokens=max_tokens_for(len(group)),
+        )
+    labels = resp.choices[0].message.parsed
+    if labels is None: return  # refusal; items keep their defaults
+    done = _apply_mapping(items, group, labels)
+    # Only cache real answers, never the pre-filled defaults
+    _label_cache.store(items, done, "sentiment", _item_text)
+    _label_cache.store(items, done, "sector", _item_text)
+
+async def abatch_assign_labels(items: list, sem: asyncio.Semaphore = None) -> None:
+    """
+    Label sentiment and sector together for items missing both fields.
+    sem caps in-flight LLM calls; pass one to share the MAX_WORKERS cap across concurrent calls.
+    """
+    if not items: return
+    targets = [i for i, it in enumerate(items) if not it.get("sentiment") and not it.get("sector")]
+    if not targets: return
+    _local_labels.fill(items, targets, "sentiment", _item_text)
+    _local_labels.fill(items, targets, "sector", _item_text)
+    _label_cache.fill(items, targets, "sentiment", _item_text)
+    _label_cache.fill(items, targets, "sector", _item_text)
+    # Items with one local/cached label are left to the single-field passes
+    targets = [i for i in targets if not items[i].get("sentiment") and not items[i].get("sector")]
+    if not targets: return
+    for i in targets:  # defaults up front; successful mappings overwrite them
+        items[i]["sentiment"], items[i]["sector"] = "Neutral", "Unknown"
+
+    sem = sem or asyncio.Semaphore(MAX_WORKERS)
+    results = await asyncio.gather(
+        *[_label_group(items, group, sem) for group in batches(targets, batch_size())],
+        return_exceptions=True,
+    )
+    for r in results:
+        if isinstance(r, Exception):
+            print(f"[labels] batch error: {type(r).__name__}")
+
+def batch_assign_labels(items: list) -> None:
+    asyncio.run(abatch_assign_labels(items))
+
+_FLUSH = object()
+
+async def alabel_stream(queue: asyncio.Queue, flush_sec: float = LABEL_FLUSH_SEC) -> None:
+    """
+    Consume items from queue (None ends the stream) and label them in micro-batches.
+    A batch is sent when it reaches the current batch_size() items or when no new item arrived
+    for flush_sec, so labeling overlaps with whatever is still producing items.
+    All micro-batches share one semaphore, so at most MAX_WORKERS LLM calls are in flight.
+    """
+    pending, batch, sem = [], [], asyncio.Semaphore(MAX_WORKERS)
+    while True:
+        try:
+            item = await (asyncio.wait_for(queue.get(), flush_sec) if batch else queue.get())
+        except asyncio.TimeoutError:
+            item = _FLUSH
+        if item is not None and item is not _FLUSH:
+            batch.append(item)
+        if batch and (item is None or item is _FLUSH or len(batch) >= batch_size()):
+            pending.append(asyncio.create_task(abatch_assign_labels(batch, sem)))
+            batch = []
+        if item is None:
+            break
+    if pending:
+        await asyncio.gather(*pending)
@@ -0,0 +1,47 @@
+"""Content-addressed on-disk cache of LLM results with per-call max age (JSON at LLM_CACHE_PATH)."""
+import os, copy, time, hashlib, threading
+import orjson
+from .config import LLM_CACHE_PATH, LLM_CACHE_KEEP_SEC
+
+__all__ = ["key", "get", "put"]
+
+_lock = threading.Lock()  # both region searches run in worker threads
+_data = None
+
+def key(model: str, prompt, **kw) -> str:
+    """sha256 over model, prompt (string or messages) and any output-shaping kwargs (tools, response_format)."""
+    blob = orjson.dumps({"m": model, "p": prompt, "kw": kw}, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(blob).hexdigest()
+
+def _load() -> dict:
+    global _data
+    if _data is None:
+        try:
+            with open(LLM_CACHE_PATH, "rb") as f:
+                _data = orjson.loads(f.read())
+        except (OSError, ValueError):
+            _data = {}
+    return _data
+
+def get(k: str, max_age: float):
+    with _lock:
+        entry = _load().get(k)
+    if entry and time.time() - entry["ts"] <= max_age:
+        return copy.deepcopy(entry["v"])  # callers mutate results (e.g. search items gain content)
+    return None
+
+def put(k: str, value) -> None:
+    now = time.time()
+    with _lock:
+        data = _load()
+        for old in [x for x, e in data.items() if now - e["ts"] > LLM_CACHE_KEEP_SEC]:
+            del data[old]
+        data[k] = {"ts": now, "v": copy.deepcopy(value)}
+        try:
+            os.makedirs(os.path.dirname(LLM_CACHE_PATH) or ".", exist_ok=True)
+            tmp = LLM_CACHE_PATH + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(orjson.dumps(data))
+            os.replace(tmp, LLM_CACHE_PATH)
+        except OSError as e:
+            print(f"[llm_cache] write error: {type(e).__name__}")
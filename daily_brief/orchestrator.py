@@ -1,10 +1,24 @@
-import os, json, datetime, re
-from jsonschema import validate
-from .fetch_news import fetch_all_news
-from .classify_sector import batch_assign_sector
-from .analyze_sentiment import batch_assign_sentiment
+import os, datetime, re, asyncio
+import orjson
+from jsonschema import validators
+from jsonschema.exceptions import best_match
+from .fetch_news import fetch_all_news, afetch_all_news
+from .classify_sector import abatch_assign_sector
+from .analyze_sentiment import abatch_assign_sentiment
+from .batch_labels import batch_assign_labels_offline
+from .config import USE_BATCH_API
+from .label_items import alabel_stream, abatch_assign_labels
 from .detect_themes import check_curated_watchlist, find_dynamic_trends, find_emerging_themes
-from .generate_brief import compose_and_generate
+from .generate_brief import compose_and_generate, summarize_regions
+
+__all__ = ["run_morning_brief", "batch_assign_all"]
+
+# Brief schema loaded and its validator built once at import, not per run
+with open(os.path.join(os.path.dirname(__file__), "schema.json"), "rb") as _f:
+    _SCHEMA = orjson.loads(_f.read())
+_VALIDATOR_CLS = validators.validator_for(_SCHEMA)
+_VALIDATOR_CLS.check_schema(_SCHEMA)
+_VALIDATOR = _VALIDATOR_CLS(_SCHEMA)
 
 _URL_IN_PARENS_RE = re.compile(r"\((https?://[^\s)]+)\)\s*$", re.I)
 
@@ -36,13 +50,39 @@ def _sentiment_counts(by_sector):
         out[sec] = c
     return out
 
+async def _label_leftovers(items: list) -> None:
+    """Fused pass first, then the single-field passes concurrently (they write disjoint keys)."""
+    await abatch_assign_labels(items)
+    await asyncio.gather(abatch_assign_sector(items), abatch_assign_sentiment(items))
+
+def batch_assign_all(items: list) -> None:
+    asyncio.run(_label_leftovers(items))
+
+async def _fetch_and_label() -> list:
+    """Fetch news and label items as they arrive, all on one event loop."""
+    queue = asyncio.Queue()
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(alabel_stream(queue))
+        items = await afetch_all_news(queue.put_nowait)
+        queue.put_nowait(None)
+    await _label_leftovers(items)
+    return items
+
+async def _themes_and_summaries(items: list):
+    # Independent blocking LLM calls (sync client): run them side by side instead of back to back
+    return await asyncio.gather(asyncio.to_thread(find_emerging_themes, items),
+                                asyncio.to_thread(summarize_regions, items))
+
 def run_morning_brief():
     date_str = datetime.date.today().isoformat()
     print(f"[{date_str}] Generating morning brief…")
 
-    items = fetch_all_news()
-    batch_assign_sector(items)      # keep or replace with offline classifier
-    batch_assign_sentiment(items)   # offline
+    if USE_BATCH_API:
+        items = fetch_all_news()
+        batch_assign_labels_offline(items)
+        batch_assign_all(items)
+    else:
+        items = asyncio.run(_fetch_and_label())  # labels overlap with article fetches
 
     by_sector = _group_by_sector(items)
     sentiment_indicators = _sentiment_counts(by_sector)
@@ -51,12 +91,12 @@ def run_morning_brief():
     dynamic_alerts = find_dynamic_trends(items)
     alerts_obj = _alerts_to_objects(curated_alerts + dynamic_alerts)
 
-    # LLM-grounded themes
-    themes = find_emerging_themes(items)
+    # LLM-grounded themes and region summaries
+    themes, summaries = asyncio.run(_themes_and_summaries(items))
 
     brief_json, brief_md = compose_and_generate(
         date=date_str,
-        market_summaries={},
+        market_summaries=summaries,
         economic_events=[],
         news_by_sector=by_sector,
         watchlist_alerts=alerts_obj,
@@ -64,15 +104,15 @@ def run_morning_brief():
         sentiment_indicators=sentiment_indicators
     )
 
-    schema_path = os.path.join(os.path.dirname(__file__), "schema.json")
-    schema = json.load(open(schema_path))
-    validate(instance=brief_json, schema=schema)
+    error = best_match(_VALIDATOR.iter_errors(brief_json))  # same error jsonschema.validate() would raise
+    if error is not None:
+        raise error
     print("JSON validation succeeded.")
 
     os.makedirs("outputs", exist_ok=True)
     jf = f"outputs/{date_str}_brief.json"
     mf = f"outputs/{date_str}_brief.md"
-    with open(jf,"w") as f: json.dump(brief_json, f, indent=2)
+    with open(jf,"wb") as f: f.write(orjson.dumps(brief_json, option=orjson.OPT_INDENT_2))
     with open(mf,"w") as f: f.write(brief_md)
     print(f"Morning brief saved: {jf}, {mf}")
 
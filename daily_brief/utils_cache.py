@@ -1,19 +1,30 @@
-import os, json, hashlib
-from .config import CACHE_PATH
+import os, time, hashlib
+import orjson
+from .config import CACHE_PATH, ARTICLE_CACHE_KEEP_SEC
+
+__all__ = ["get", "set", "set_many"]
+
+_data = None  # loaded once per process; entries carry a "fetched" timestamp
 
 def _load():
-    if os.path.exists(CACHE_PATH):
-        with open(CACHE_PATH, "r") as f:
-            try:
-                return json.load(f)
-            except Exception:
-                return {}
-    return {}
+    global _data
+    if _data is None:
+        _data = {}
+        if os.path.exists(CACHE_PATH):
+            with open(CACHE_PATH, "rb") as f:
+                try:
+                    _data = orjson.loads(f.read())
+                except Exception:
+                    _data = {}
+    return _data
 
 def _save(data: dict):
+    cutoff = time.time() - ARTICLE_CACHE_KEEP_SEC
+    for k in [k for k, v in data.items() if v.get("fetched", 0) < cutoff]:
+        del data[k]
     os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
-    with open(CACHE_PATH, "w") as f:
-        json.dump(data, f, indent=2)
+    with open(CACHE_PATH, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
 def _key(url: str) -> str:
     return hashlib.sha256((url or "").encode("utf-8")).hexdigest()
@@ -22,6 +33,12 @@ def get(url: str) -> dict:
     return _load().get(_key(url), {})
 
 def set(url: str, value: dict):
+    set_many({url: value})
+
+def set_many(values: dict):
+    """Store {url: value} and write the file once."""
+    if not values: return
     d = _load()
-    d[_key(url)] = value
+    for url, value in values.items():
+        d[_key(url)] = value
     _save(d)
@@ -0,0 +1,4 @@
+import os
+
+# daily_brief.fetch_news exits at import without a key; tests never reach the API
+os.environ.setdefault("OPENAI_API_KEY", "test")
@@ -0,0 +1,33 @@
+import asyncio
+import importlib.util
+
+import pytest
+
+from daily_brief import fetch_news
+
+_HTML = (
+    "<html><head><title>Title</title><meta name='description' content='Meta description'></head>"
+    "<body><p>" + "Jakarta stocks rallied on bank earnings. " * 3 + "</p></body></html>"
+)
+
+
+@pytest.mark.skipif(importlib.util.find_spec("selectolax") is None, reason="selectolax not installed")
+def test_fast_parser_loads_when_selectolax_installed():
+    assert fetch_news._FAST_PARSER
+
+
+def test_content_from_html_prefers_paragraphs():
+    assert fetch_news._content_from_html(_HTML).startswith("Jakarta stocks rallied")
+
+
+def test_parse_fallback_runs_bs4_in_process_pool(monkeypatch):
+    monkeypatch.setattr(fetch_news, "_FAST_PARSER", False)
+    monkeypatch.setattr(fetch_news, "_PARSE_POOL", None)
+    try:
+        content = asyncio.run(fetch_news._parse(_HTML))
+        assert fetch_news._PARSE_POOL is not None
+    finally:
+        if fetch_news._PARSE_POOL is not None:
+            fetch_news._PARSE_POOL.shutdown()
+    assert content == fetch_news._bs4_content(_HTML)
+    assert content.startswith("Jakarta stocks rallied")